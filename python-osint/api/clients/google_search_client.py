@@ -4,11 +4,16 @@ Provides search capabilities using Google's Custom Search JSON API
 """
 
 import asyncio
+import copy
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -116,6 +121,37 @@ class GoogleSearchRateLimit:
         }
 
 
+class _ResponseCache:
+    """Small LRU cache of search responses whose entries expire after a TTL"""
+    
+    def __init__(self, maxsize: int = 4096, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+    
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: tuple, value: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Clients are created per request, so the cache lives at module level to be
+# shared by all of them
+_response_cache = _ResponseCache()
+
+
 class GoogleSearchClient:
     """
     Google Custom Search API client with rate limiting and error handling
@@ -125,7 +161,8 @@ class GoogleSearchClient:
     """
     
     def __init__(self, api_key: str, cse_id: str, rate_limit: GoogleSearchRateLimit = None, 
-                 calls_per_day: int = 100, calls_per_minute: int = 100):
+                 calls_per_day: int = 100, calls_per_minute: int = 100,
+                 enable_response_cache: bool = True):
         """
         Initialize Google Search client
         
@@ -135,6 +172,8 @@ class GoogleSearchClient:
             rate_limit: Rate limiter instance (optional)
             calls_per_day: Maximum calls per day (default: 100 for free tier)
             calls_per_minute: Maximum calls per minute (default: 100 for most plans)
+            enable_response_cache: Serve repeated searches from a short-lived
+                (5 minute) response cache shared by all clients
         """
         self.api_key = api_key
         self.cse_id = cse_id
@@ -143,6 +182,15 @@ class GoogleSearchClient:
             calls_per_minute=calls_per_minute
         )
         self._service = None
+        self._local = threading.local()
+        self._response_cache = _response_cache if enable_response_cache else None
+    
+    def _get_http(self):
+        """Get the calling thread's HTTP object (httplib2 is not thread-safe)"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = build_http()
+        return http
     
     def _get_service(self):
         """Get or create Google API service"""
@@ -196,10 +244,6 @@ class GoogleSearchClient:
         Returns:
             Search results dictionary
         """
-        await self._wait_for_rate_limit()
-        
-        service = self._get_service()
-        
         # Build search parameters
         search_params = {
             'q': query,
@@ -231,6 +275,19 @@ class GoogleSearchClient:
         if search_type:
             search_params['searchType'] = search_type
         
+        # Cache hits skip both the network call and the rate limiter (no quota
+        # is spent); callers get a copy so they can't alter the cached entry
+        cache_key = tuple(sorted(search_params.items()))
+        if self._response_cache is not None:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Google search cache hit for: {query}")
+                return copy.deepcopy(cached)
+        
+        await self._wait_for_rate_limit()
+        
+        service = self._get_service()
+        
         try:
             logger.info(f"Performing Google search for: {query}")
             
@@ -238,10 +295,12 @@ class GoogleSearchClient:
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(
                 None, 
-                lambda: service.cse().list(**search_params).execute()
+                lambda: service.cse().list(**search_params).execute(http=self._get_http())
             )
             
             logger.info(f"Search completed. Found {len(result.get('items', []))} results")
+            if self._response_cache is not None:
+                self._response_cache.set(cache_key, copy.deepcopy(result))
             return result
             
         except HttpError as e:
@@ -6,6 +6,7 @@ Handles all interactions with VirusTotal's REST API v3
 import aiohttp
 import asyncio
 import logging
+import orjson
 import time
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass
@@ -28,6 +29,22 @@ class VirusTotalAPIError(Exception):
         self.error_code = error_code
         super().__init__(self.message)
 
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Decode a response body directly from its raw bytes"""
+    # orjson parses bytes as-is, so the body is never copied into an
+    # intermediate str as with response.json(); this keeps peak memory down
+    # on large responses such as search results with hundreds of objects
+    body = await response.read()
+    if not body.strip():
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise VirusTotalAPIError(
+            f"Invalid JSON response: {e}",
+            status_code=response.status
+        )
+
 class VirusTotalClient:
     """
     Async client for VirusTotal API v3
@@ -36,10 +53,24 @@ class VirusTotalClient:
     
     BASE_URL = "https://www.virustotal.com/api/v3"
     
-    def __init__(self, api_key: str, rate_limit: VirusTotalRateLimit = None):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit: VirusTotalRateLimit = None,
+        session: Optional[aiohttp.ClientSession] = None
+    ):
         self.api_key = api_key
         self.rate_limit = rate_limit or VirusTotalRateLimit()
-        self.session: Optional[aiohttp.ClientSession] = None
+        # An injected session is shared with other clients (keep-alive across
+        # requests); it is owned by whoever created it and never closed here
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._headers = {
+            "x-apikey": self.api_key,
+            "accept": "application/json",
+            "content-type": "application/json"
+        }
+        self._timeout = aiohttp.ClientTimeout(total=30)
         self.last_request_time = 0
         self.request_count = 0
         self.daily_request_count = 0
@@ -57,21 +88,15 @@ class VirusTotalClient:
     async def _create_session(self):
         """Create HTTP session with proper headers"""
         if not self.session:
-            headers = {
-                "x-apikey": self.api_key,
-                "accept": "application/json",
-                "content-type": "application/json"
-            }
-            timeout = aiohttp.ClientTimeout(total=30)
             self.session = aiohttp.ClientSession(
-                headers=headers,
-                timeout=timeout,
+                headers=self._headers,
+                timeout=self._timeout,
                 connector=aiohttp.TCPConnector(limit=10)
             )
     
     async def _close_session(self):
         """Close HTTP session"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
     
@@ -92,18 +117,19 @@ class VirusTotalClient:
                 error_code="DAILY_LIMIT_EXCEEDED"
             )
         
-        # Implement per-minute rate limiting
-        time_since_last_request = current_time - self.last_request_time
+        # Implement per-minute rate limiting. The send slot is reserved before
+        # sleeping, so concurrent callers queue up behind each other instead
+        # of all waking after the same wait
         min_interval = 60.0 / self.rate_limit.requests_per_minute
+        send_time = max(current_time, self.last_request_time + min_interval)
+        self.last_request_time = send_time
+        self.request_count += 1
+        self.daily_request_count += 1
         
-        if time_since_last_request < min_interval:
-            wait_time = min_interval - time_since_last_request
+        wait_time = send_time - current_time
+        if wait_time > 0:
             logger.info(f"Rate limiting: waiting {wait_time:.2f} seconds")
             await asyncio.sleep(wait_time)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
-        self.daily_request_count += 1
     
     async def _make_request(
         self, 
@@ -132,9 +158,11 @@ class VirusTotalClient:
                 url=url,
                 params=params,
                 data=data,
-                json=json_data
+                json=json_data,
+                headers=self._headers,
+                timeout=self._timeout
             ) as response:
-                response_data = await response.json()
+                response_data = await _read_json(response)
                 
                 if response.status == 200:
                     return response_data
@@ -187,9 +215,11 @@ class VirusTotalClient:
             async with self.session.request(
                 method=method,
                 url=url,
-                data=form_data
+                data=form_data,
+                headers=self._headers,
+                timeout=self._timeout
             ) as response:
-                response_data = await response.json()
+                response_data = await _read_json(response)
                 
                 if response.status == 200:
                     return response_data
@@ -277,7 +307,7 @@ class VirusTotalClient:
         async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
             try:
                 async with session.post(url_endpoint, data=form_data) as response:
-                    response_data = await response.json()
+                    response_data = await _read_json(response)
                     
                     if response.status == 200:
                         return response_data
@@ -37,6 +37,8 @@ class Settings(BaseSettings):
     google_cse_id: Optional[str] = Field(None, env="GOOGLE_CSE_ID")
     google_calls_per_day: int = Field(default=100, env="GOOGLE_CALLS_PER_DAY")
     google_calls_per_minute: int = Field(default=50, env="GOOGLE_CALLS_PER_MINUTE")
+    google_response_cache: bool = Field(default=True, env="GOOGLE_RESPONSE_CACHE")
+    dorking_max_concurrency: int = Field(default=5, env="DORKING_MAX_CONCURRENCY")
     haveibeenpwned_api_key: Optional[str] = Field(None, env="HAVEIBEENPWNED_API_KEY")
     
     # Paths
@@ -231,28 +231,44 @@ def get_templates_by_priority(templates, priority):
     """Filter templates by priority level"""
     return [t for t in templates if t["priority"] == priority]
 
-def format_dork_template(template, target_alias=None, target_domain=None, target_company=None):
+def build_dork_placeholders(target_alias=None, target_domain=None, target_company=None):
     """
-    Format a dork template with actual target values
+    Build the placeholder mapping used to fill dork templates
+    
+    Build it once per target and reuse it with str.format_map() for every
+    template instead of re-deriving the values per template. A template
+    using any other placeholder raises KeyError when formatted.
     
     Args:
-        template: The dork template dictionary
         target_alias: The alias/username to search for
         target_domain: The domain to search
         target_company: The company name to search
         
     Returns:
-        Formatted dork string ready for search
+        Mapping of placeholder names to values
     """
-    dork = template["dork"]
-    target_clean = target_alias.lstrip('@') if target_alias else ''
-    
-    # Replace placeholders
-    formatted_dork = dork.format(
+    return dict(
         target_alias=target_alias or '',
-        target_clean=target_clean,
+        target_clean=target_alias.lstrip('@') if target_alias else '',
         target_domain=target_domain or '',
         target_company=target_company or ''
     )
+
+def format_dork_template(template, target_alias=None, target_domain=None, target_company=None):
+    """
+    Format a dork template with actual target values
     
-    return formatted_dork
\ No newline at end of file
+    Args:
+        template: The dork template dictionary
+        target_alias: The alias/username to search for
+        target_domain: The domain to search
+        target_company: The company name to search
+        
+    Returns:
+        Formatted dork string ready for search
+        
+    Raises:
+        KeyError: If the template uses an unknown placeholder
+    """
+    placeholders = build_dork_placeholders(target_alias, target_domain, target_company)
+    return template["dork"].format_map(placeholders)
@@ -11,6 +11,7 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+import aiohttp
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -70,6 +71,10 @@ app.include_router(alias_search_router, prefix="/api/v1")
 async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting OSINT Analysis API...")
+    # Shared keep-alive session for outbound API clients (VirusTotal)
+    app.state.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=50, limit_per_host=10, ttl_dns_cache=300)
+    )
     await analysis_manager.initialize()
     logger.info("OSINT Analysis API started successfully")
 
@@ -78,6 +83,7 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down OSINT Analysis API...")
     await analysis_manager.cleanup()
+    await app.state.http_session.close()
     logger.info("OSINT Analysis API stopped")
 
 @app.get("/", response_model=Dict[str, str])
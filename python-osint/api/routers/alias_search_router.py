@@ -47,7 +47,8 @@ async def get_google_search_client():
         api_key=settings.google_api_key, 
         cse_id=settings.google_cse_id,
         calls_per_day=calls_per_day,
-        calls_per_minute=calls_per_minute
+        calls_per_minute=calls_per_minute,
+        enable_response_cache=settings.google_response_cache
     )
     try:
         yield client
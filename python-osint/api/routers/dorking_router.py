@@ -4,9 +4,12 @@ Endpoints for comprehensive OSINT analysis using dorking templates
 """
 
 import logging
+from datetime import datetime
+from enum import Enum
 from typing import Dict, Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel, Field
 
 from api.clients import GoogleSearchClient
@@ -18,6 +21,30 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/dorking", tags=["Advanced OSINT Dorking"])
 
+ORJSON_OPT = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_response(content: Any) -> Response:
+    """
+    Serialize large dorking payloads with orjson directly, skipping
+    FastAPI's jsonable_encoder and response model validation
+    """
+    return Response(
+        content=orjson.dumps(content, default=_default, option=ORJSON_OPT),
+        media_type="application/json"
+    )
+
 
 class DorkingAnalysisRequest(BaseModel):
     """Request model for dorking analysis"""
@@ -54,8 +81,12 @@ async def get_dorking_service():
             detail="Google Custom Search Engine ID not configured"
         )
     
-    google_client = GoogleSearchClient(settings.google_api_key, settings.google_cse_id)
-    service = DorkingService(google_client)
+    google_client = GoogleSearchClient(
+        settings.google_api_key,
+        settings.google_cse_id,
+        enable_response_cache=settings.google_response_cache
+    )
+    service = DorkingService(google_client, max_concurrency=settings.dorking_max_concurrency)
     
     try:
         yield service
@@ -100,11 +131,13 @@ async def analyze_target(
                 detail=f"Unsupported target type: {request.target_type}. Supported types: alias, domain"
             )
         
-        # Add target_type to results
-        results["target_type"] = request.target_type
-        results["target"] = request.target
-        
-        return DorkingAnalysisResponse(**results)
+        return _json_response({
+            "target": request.target,
+            "target_type": request.target_type,
+            "total_templates_used": results["total_templates_used"],
+            "analysis_results": results["analysis_results"],
+            "summary": results["summary"]
+        })
         
     except Exception as e:
         logger.error(f"Dorking analysis failed: {e}")
@@ -130,7 +163,7 @@ async def analyze_alias_get(
             max_results_per_query=max_results
         )
         
-        return results
+        return _json_response(results)
         
     except Exception as e:
         logger.error(f"Alias analysis failed: {e}")
@@ -50,7 +50,8 @@ async def get_google_search_client():
         api_key=settings.google_api_key, 
         cse_id=settings.google_cse_id,
         calls_per_day=calls_per_day,
-        calls_per_minute=calls_per_minute
+        calls_per_minute=calls_per_minute,
+        enable_response_cache=settings.google_response_cache
     )
     try:
         yield client
@@ -84,7 +85,8 @@ def _convert_google_response_to_summary(result: Dict[str, Any], query: str) -> G
         
         simplified_items.append(simplified_item)
     
-    return GoogleSearchSummary(
+    # Every field is already coerced above, so skip re-validating trusted output
+    return GoogleSearchSummary.model_construct(
         query=query,
         total_results=int(search_info.get('totalResults', '0')),
         search_time=float(search_info.get('searchTime', 0)),
@@ -282,8 +282,7 @@ async def check_breached_account(
                 data_classes_affected=list(data_classes_affected),
                 most_recent_breach=most_recent_date,
                 verified_breaches_count=verified_count,
-                unverified_breaches_count=unverified_count,
-                risk_assessment=""  # Will be set by validator
+                unverified_breaches_count=unverified_count
             )
             
             logger.info(f"Found {len(breaches)} breaches for account {email}")
@@ -396,8 +395,7 @@ async def check_pwned_password(request: PwnedPasswordRequest):
             response = PwnedPasswordResponse(
                 is_pwned=result.is_pwned,
                 pwn_count=result.count,
-                hash_suffix=result.hash_suffix,
-                risk_level=""  # Will be set by validator
+                hash_suffix=result.hash_suffix
             )
             
             logger.info(f"Password check completed - Pwned: {result.is_pwned}, Count: {result.count}")
@@ -435,8 +433,7 @@ async def check_pwned_password_hash(request: PwnedPasswordHashRequest):
             response = PwnedPasswordResponse(
                 is_pwned=result.is_pwned,
                 pwn_count=result.count,
-                hash_suffix=result.hash_suffix,
-                risk_level=""  # Will be set by validator
+                hash_suffix=result.hash_suffix
             )
             
             logger.info(f"Hash check completed - Pwned: {result.is_pwned}, Count: {result.count}")
@@ -520,8 +517,7 @@ async def analyze_email(request: BreachedAccountRequest):
                 data_classes_affected=list(data_classes_affected),
                 most_recent_breach=most_recent_date,
                 verified_breaches_count=verified_count,
-                unverified_breaches_count=unverified_count,
-                risk_assessment=""  # Will be set by validator
+                unverified_breaches_count=unverified_count
             )
             
             response = HaveIBeenPwnedAnalysisResponse(
@@ -615,8 +611,7 @@ async def analyze_password(request: PwnedPasswordRequest):
             password_analysis = PwnedPasswordResponse(
                 is_pwned=result.is_pwned,
                 pwn_count=result.count,
-                hash_suffix=result.hash_suffix,
-                risk_level=""  # Will be set by validator
+                hash_suffix=result.hash_suffix
             )
             
             response = HaveIBeenPwnedAnalysisResponse(
@@ -684,8 +679,7 @@ async def bulk_email_check(request: BulkEmailCheckRequest):
         items_failed=len(failed_items),
         analysis_results=results,
         failed_items=failed_items,
-        processing_time_seconds=processing_time,
-        summary={}  # Will be generated by validator
+        processing_time_seconds=processing_time
     )
     
     logger.info(f"Bulk email check completed - {len(results)} successful, {len(failed_items)} failed")
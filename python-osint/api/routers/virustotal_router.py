@@ -10,14 +10,15 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from urllib.parse import quote_plus
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File, Form, Query, Request
 from fastapi.responses import JSONResponse
 
 from api.clients import VirusTotalClient, VirusTotalAPIError
 from api.schemas import (
     VirusTotalFileRequest, VirusTotalURLRequest, VirusTotalHashRequest,
     VirusTotalDomainRequest, VirusTotalIPRequest, VirusTotalSearchRequest,
-    VirusTotalAnalysisResult, VirusTotalBulkResult, VirusTotalServiceInfo
+    VirusTotalAnalysisResult, VirusTotalBulkResult, VirusTotalServiceInfo,
+    AnalysisStats, EngineResult
 )
 from api.config import get_settings
 
@@ -26,8 +27,11 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/virustotal", tags=["VirusTotal"])
 
+# VirusTotal timestamps are converted to datetime once, here at the API boundary
+_fromtimestamp = datetime.fromtimestamp
+
 # Dependency to get VirusTotal client
-async def get_virustotal_client():
+async def get_virustotal_client(request: Request):
     """Dependency to create and manage VirusTotal client"""
     settings = get_settings()
     
@@ -37,7 +41,11 @@ async def get_virustotal_client():
             detail="VirusTotal API key not configured"
         )
     
-    client = VirusTotalClient(settings.virustotal_api_key)
+    # Reuse the app-wide keep-alive session when one was opened at startup
+    client = VirusTotalClient(
+        settings.virustotal_api_key,
+        session=getattr(request.app.state, "http_session", None)
+    )
     await client._create_session()
     try:
         yield client
@@ -55,16 +63,18 @@ def _convert_vt_response_to_analysis_result(vt_data: Dict[str, Any], resource_ty
         stats = attributes.get('last_analysis_stats', {})
         analysis_stats = None
         if stats:
-            from api.schemas.virustotal_schemas import AnalysisStats
             analysis_stats = AnalysisStats(**stats)
         
         # Extract engine results
-        engines = attributes.get('last_analysis_results', {})
+        engines = {
+            name: EngineResult.from_vt(engine)
+            for name, engine in attributes.get('last_analysis_results', {}).items()
+        }
         
         # Get analysis date
         analysis_date = attributes.get('last_analysis_date')
         if analysis_date:
-            analysis_date = datetime.fromtimestamp(analysis_date)
+            analysis_date = _fromtimestamp(analysis_date)
         
         return VirusTotalAnalysisResult(
             resource_type=resource_type,
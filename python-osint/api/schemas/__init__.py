@@ -12,7 +12,7 @@ from .virustotal_schemas import (
 
 from .google_search_schemas import (
     GoogleSearchRequest, GoogleImageSearchRequest, GoogleSiteSearchRequest,
-    SearchInformation, SearchItem, SearchContext,
+    SearchInformation, SearchImageMeta, SearchItem, SearchContext,
     GoogleSearchResult, GoogleSearchSummary, GoogleSearchInfo, GoogleSearchError,
     BulkSearchRequest, BulkSearchResult
 )
@@ -32,7 +32,7 @@ __all__ = [
     'VirusTotalConfig', 'AnalysisStats', 'EngineResult',
     # Google Search schemas
     'GoogleSearchRequest', 'GoogleImageSearchRequest', 'GoogleSiteSearchRequest',
-    'SearchInformation', 'SearchItem', 'SearchContext',
+    'SearchInformation', 'SearchImageMeta', 'SearchItem', 'SearchContext',
     'GoogleSearchResult', 'GoogleSearchSummary', 'GoogleSearchInfo', 'GoogleSearchError',
     'BulkSearchRequest', 'BulkSearchResult',
     # Alias Search schemas
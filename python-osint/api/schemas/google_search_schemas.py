@@ -3,9 +3,29 @@ Google Custom Search API Schemas
 Pydantic models for Google Custom Search requests and responses
 """
 
-from typing import Dict, Any, List, Optional, Union
+import re
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
+
+
+# Allowed values for the enumerated request parameters, built once at import
+# instead of on every validator call
+_SAFE_SEARCH_VALUES: Final[Tuple[str, ...]] = ('active', 'medium', 'off')
+_IMAGE_SIZE_VALUES: Final[Tuple[str, ...]] = (
+    'icon', 'small', 'medium', 'large', 'xlarge', 'xxlarge', 'huge'
+)
+_IMAGE_TYPE_VALUES: Final[Tuple[str, ...]] = (
+    'clipart', 'face', 'lineart', 'stock', 'photo', 'animated'
+)
+_IMAGE_COLOR_TYPE_VALUES: Final[Tuple[str, ...]] = ('color', 'gray', 'mono', 'trans')
+_IMAGE_DOMINANT_COLOR_VALUES: Final[Tuple[str, ...]] = (
+    'black', 'blue', 'brown', 'gray', 'green', 'orange',
+    'pink', 'purple', 'red', 'teal', 'white', 'yellow'
+)
+
+# Format: d[number], w[number], m[number], y[number]
+_DATE_RESTRICT_RE: Final = re.compile(r'^[dwmy]\d+$')
 
 
 class GoogleSearchRequest(BaseModel):
@@ -26,18 +46,15 @@ class GoogleSearchRequest(BaseModel):
     
     @validator('safe')
     def validate_safe_search(cls, v):
-        allowed_values = ['active', 'medium', 'off']
-        if v not in allowed_values:
-            raise ValueError(f"safe must be one of {allowed_values}")
+        if v not in _SAFE_SEARCH_VALUES:
+            raise ValueError(f"safe must be one of {list(_SAFE_SEARCH_VALUES)}")
         return v
     
     @validator('date_restrict')
     def validate_date_restrict(cls, v):
         if v is None:
             return v
-        # Format: d[number], w[number], m[number], y[number]
-        import re
-        if not re.match(r'^[dwmy]\d+$', v):
+        if not _DATE_RESTRICT_RE.match(v):
             raise ValueError("date_restrict must be in format d1, w1, m1, y1, etc.")
         return v
 
@@ -53,37 +70,32 @@ class GoogleImageSearchRequest(GoogleSearchRequest):
     def validate_image_size(cls, v):
         if v is None:
             return v
-        allowed_values = ['icon', 'small', 'medium', 'large', 'xlarge', 'xxlarge', 'huge']
-        if v not in allowed_values:
-            raise ValueError(f"image_size must be one of {allowed_values}")
+        if v not in _IMAGE_SIZE_VALUES:
+            raise ValueError(f"image_size must be one of {list(_IMAGE_SIZE_VALUES)}")
         return v
     
     @validator('image_type')
     def validate_image_type(cls, v):
         if v is None:
             return v
-        allowed_values = ['clipart', 'face', 'lineart', 'stock', 'photo', 'animated']
-        if v not in allowed_values:
-            raise ValueError(f"image_type must be one of {allowed_values}")
+        if v not in _IMAGE_TYPE_VALUES:
+            raise ValueError(f"image_type must be one of {list(_IMAGE_TYPE_VALUES)}")
         return v
     
     @validator('image_color_type')
     def validate_image_color_type(cls, v):
         if v is None:
             return v
-        allowed_values = ['color', 'gray', 'mono', 'trans']
-        if v not in allowed_values:
-            raise ValueError(f"image_color_type must be one of {allowed_values}")
+        if v not in _IMAGE_COLOR_TYPE_VALUES:
+            raise ValueError(f"image_color_type must be one of {list(_IMAGE_COLOR_TYPE_VALUES)}")
         return v
     
     @validator('image_dominant_color')
     def validate_image_dominant_color(cls, v):
         if v is None:
             return v
-        allowed_values = ['black', 'blue', 'brown', 'gray', 'green', 'orange', 
-                         'pink', 'purple', 'red', 'teal', 'white', 'yellow']
-        if v not in allowed_values:
-            raise ValueError(f"image_dominant_color must be one of {allowed_values}")
+        if v not in _IMAGE_DOMINANT_COLOR_VALUES:
+            raise ValueError(f"image_dominant_color must be one of {list(_IMAGE_DOMINANT_COLOR_VALUES)}")
         return v
 
 
@@ -103,8 +115,24 @@ class SearchInformation(BaseModel):
     formatted_total_results: str = Field(..., description="Formatted total results count")
 
 
+class SearchImageMeta(BaseModel):
+    """Image metadata returned for image search results"""
+    # The API returns camelCase keys; snake_case names are accepted as well
+    model_config = ConfigDict(populate_by_name=True)
+    
+    context_link: Optional[str] = Field(None, alias="contextLink", description="URL of the page hosting the image")
+    height: Optional[int] = Field(None, description="Image height in pixels")
+    width: Optional[int] = Field(None, description="Image width in pixels")
+    byte_size: Optional[int] = Field(None, alias="byteSize", description="Image size in bytes")
+    thumbnail_link: Optional[str] = Field(None, alias="thumbnailLink", description="Thumbnail URL")
+    thumbnail_height: Optional[int] = Field(None, alias="thumbnailHeight", description="Thumbnail height in pixels")
+    thumbnail_width: Optional[int] = Field(None, alias="thumbnailWidth", description="Thumbnail width in pixels")
+
+
 class SearchItem(BaseModel):
     """Individual search result item"""
+    model_config = ConfigDict(frozen=True)
+
     kind: str = Field(..., description="Resource type")
     title: str = Field(..., description="Result title")
     html_title: Optional[str] = Field(None, description="HTML formatted title")
@@ -117,7 +145,7 @@ class SearchItem(BaseModel):
     html_formatted_url: Optional[str] = Field(None, description="HTML formatted URL")
     
     # Image-specific fields
-    image: Optional[Dict[str, Any]] = Field(None, description="Image metadata")
+    image: Optional[SearchImageMeta] = Field(None, description="Image metadata")
     
     # Additional metadata
     mime: Optional[str] = Field(None, description="MIME type")
@@ -136,7 +164,7 @@ class GoogleSearchResult(BaseModel):
     queries: Dict[str, List[Dict[str, Any]]] = Field(..., description="Query information")
     context: Optional[SearchContext] = Field(None, description="Search context")
     search_information: SearchInformation = Field(..., description="Search metadata")
-    items: List[SearchItem] = Field(default=[], description="Search result items")
+    items: List[SearchItem] = Field(default_factory=list, description="Search result items")
 
 
 class GoogleSearchSummary(BaseModel):
@@ -191,6 +219,7 @@ __all__ = [
     'GoogleImageSearchRequest', 
     'GoogleSiteSearchRequest',
     'SearchInformation',
+    'SearchImageMeta',
     'SearchItem',
     'SearchContext',
     'GoogleSearchResult',
@@ -2,11 +2,29 @@
 Pydantic schemas for HaveIBeenPwned API integration
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, EmailStr, Field, validator
+from typing import List, Optional, Dict, Final, Tuple
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, computed_field, validator
+from typing_extensions import TypedDict
 import re
 
 
+# Validator constants, built once at import instead of on every call.
+# Risk levels are ordered from lowest to highest severity
+_RISK_LEVELS: Final[Tuple[str, ...]] = ('safe', 'low', 'medium', 'high', 'critical')
+_RISK_RANK: Final[Dict[str, int]] = {level: rank for rank, level in enumerate(_RISK_LEVELS)}
+_HASH_TYPES: Final[Tuple[str, ...]] = ('sha1', 'ntlm')
+_DOMAIN_RE: Final = re.compile(
+    r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
+)
+
+
+def _validate_domain(v: Optional[str]) -> Optional[str]:
+    """Shared domain format check for the request validators"""
+    if v is not None and _DOMAIN_RE.match(v) is None:
+        raise ValueError('Invalid domain format')
+    return v
+
+
 class BreachedAccountRequest(BaseModel):
     """Request schema for checking breached accounts"""
     email: EmailStr
@@ -16,11 +34,7 @@ class BreachedAccountRequest(BaseModel):
 
     @validator('domain_filter')
     def validate_domain(cls, v):
-        if v is not None:
-            domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
-            if not re.match(domain_pattern, v):
-                raise ValueError('Invalid domain format')
-        return v
+        return _validate_domain(v)
 
 
 class BreachedDomainRequest(BaseModel):
@@ -29,10 +43,7 @@ class BreachedDomainRequest(BaseModel):
 
     @validator('domain')
     def validate_domain(cls, v):
-        domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
-        if not re.match(domain_pattern, v):
-            raise ValueError('Invalid domain format')
-        return v
+        return _validate_domain(v)
 
 
 class PwnedPasswordRequest(BaseModel):
@@ -56,7 +67,7 @@ class PwnedPasswordHashRequest(BaseModel):
 
     @validator('hash_type')
     def validate_hash_type(cls, v):
-        if v.lower() not in ['sha1', 'ntlm']:
+        if v.lower() not in _HASH_TYPES:
             raise ValueError('hash_type must be "sha1" or "ntlm"')
         return v.lower()
 
@@ -73,11 +84,7 @@ class AllBreachesRequest(BaseModel):
 
     @validator('domain_filter')
     def validate_domain(cls, v):
-        if v is not None:
-            domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
-            if not re.match(domain_pattern, v):
-                raise ValueError('Invalid domain format')
-        return v
+        return _validate_domain(v)
 
 
 class BreachByNameRequest(BaseModel):
@@ -95,6 +102,8 @@ class BreachByNameRequest(BaseModel):
 # Response schemas
 class BreachResponse(BaseModel):
     """Response schema for breach information"""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     title: str
     domain: str
@@ -116,14 +125,16 @@ class BreachResponse(BaseModel):
 
 class PwnedPasswordResponse(BaseModel):
     """Response schema for pwned password information"""
+    model_config = ConfigDict(frozen=True)
+
     is_pwned: bool = Field(..., description="Whether the password has been pwned")
     pwn_count: int = Field(..., description="Number of times the password appears in breaches")
     hash_suffix: str = Field(..., description="Last 35 characters of the hash (for reference)")
-    risk_level: str = Field(..., description="Risk assessment based on pwn count")
 
-    @validator('risk_level', always=True)
-    def determine_risk_level(cls, v, values):
-        pwn_count = values.get('pwn_count', 0)
+    @computed_field(description="Risk assessment based on pwn count")
+    @property
+    def risk_level(self) -> str:
+        pwn_count = self.pwn_count
         if pwn_count == 0:
             return 'safe'
         elif pwn_count < 10:
@@ -138,6 +149,8 @@ class PwnedPasswordResponse(BaseModel):
 
 class BreachedDomainResponse(BaseModel):
     """Response schema for breached domain information"""
+    model_config = ConfigDict(frozen=True)
+
     email: str
     breaches: List[str]
 
@@ -152,16 +165,15 @@ class BreachedAccountResponse(BaseModel):
     most_recent_breach: Optional[str] = Field(default=None, description="Date of most recent breach")
     verified_breaches_count: int = Field(..., description="Number of verified breaches")
     unverified_breaches_count: int = Field(..., description="Number of unverified breaches")
-    risk_assessment: str = Field(..., description="Overall risk assessment")
 
-    @validator('risk_assessment', always=True)
-    def determine_risk_assessment(cls, v, values):
-        breach_count = values.get('breach_count', 0)
-        verified_count = values.get('verified_breaches_count', 0)
+    @computed_field(description="Overall risk assessment")
+    @property
+    def risk_assessment(self) -> str:
+        breach_count = self.breach_count
         
         if breach_count == 0:
             return 'safe'
-        elif verified_count == 0:
+        elif self.verified_breaches_count == 0:
             return 'low'  # Only unverified breaches
         elif breach_count < 3:
             return 'medium'
@@ -181,6 +193,15 @@ class HealthCheckResponse(BaseModel):
     error: Optional[str] = None
 
 
+class AnalysisSummary(TypedDict, total=False):
+    """Summary derived from the individual HIBP checks of one target"""
+    total_checks_performed: int
+    breaches_found: bool
+    password_compromised: bool
+    risk_level: str
+    recommendations: List[str]
+
+
 class HaveIBeenPwnedAnalysisResponse(BaseModel):
     """Complete analysis response combining all HIBP checks"""
     target: str
@@ -197,47 +218,53 @@ class HaveIBeenPwnedAnalysisResponse(BaseModel):
     password_analysis: Optional[PwnedPasswordResponse] = None
     
     # Summary
-    summary: Dict[str, Any] = Field(default_factory=dict)
-    
-    @validator('summary', always=True)
-    def generate_summary(cls, v, values):
-        summary = {
-            'total_checks_performed': 0,
-            'breaches_found': False,
-            'password_compromised': False,
-            'risk_level': 'safe',
-            'recommendations': []
-        }
+    @computed_field
+    @property
+    def summary(self) -> AnalysisSummary:
+        account_data = self.account_breaches
+        domain_breaches = self.domain_breaches
+        password_data = self.password_analysis
+        
+        checks_performed = 0
+        breaches_found = False
+        password_compromised = False
+        risk_level = 'safe'
+        recommendations = []
         
         # Account breach analysis
-        if values.get('account_breaches'):
-            summary['total_checks_performed'] += 1
-            account_data = values['account_breaches']
+        if account_data:
+            checks_performed += 1
             if account_data.is_breached:
-                summary['breaches_found'] = True
-                summary['risk_level'] = account_data.risk_assessment
-                summary['recommendations'].append('Change passwords for all accounts associated with this email')
+                breaches_found = True
+                risk_level = account_data.risk_assessment
+                recommendations.append('Change passwords for all accounts associated with this email')
                 if account_data.breach_count > 3:
-                    summary['recommendations'].append('Consider using a different email address for sensitive accounts')
+                    recommendations.append('Consider using a different email address for sensitive accounts')
         
         # Domain breach analysis
-        if values.get('domain_breaches'):
-            summary['total_checks_performed'] += 1
-            if values['domain_breaches']:
-                summary['breaches_found'] = True
-                if summary['risk_level'] == 'safe':
-                    summary['risk_level'] = 'medium'
-                summary['recommendations'].append('Review security practices for this domain')
+        if domain_breaches:
+            checks_performed += 1
+            breaches_found = True
+            if risk_level == 'safe':
+                risk_level = 'medium'
+            recommendations.append('Review security practices for this domain')
         
         # Password analysis
-        if values.get('password_analysis'):
-            summary['total_checks_performed'] += 1
-            password_data = values['password_analysis']
+        if password_data:
+            checks_performed += 1
             if password_data.is_pwned:
-                summary['password_compromised'] = True
-                summary['risk_level'] = password_data.risk_level
-                summary['recommendations'].append('Change this password immediately')
-                summary['recommendations'].append('Use a unique, strong password')
+                password_compromised = True
+                risk_level = password_data.risk_level
+                recommendations.append('Change this password immediately')
+                recommendations.append('Use a unique, strong password')
+        
+        summary = {
+            'total_checks_performed': checks_performed,
+            'breaches_found': breaches_found,
+            'password_compromised': password_compromised,
+            'risk_level': risk_level,
+            'recommendations': recommendations
+        }
         
         return summary
 
@@ -263,6 +290,16 @@ class BulkPasswordCheckRequest(BaseModel):
         }
 
 
+class BulkAnalysisSummary(TypedDict, total=False):
+    """Summary aggregated over all results of a bulk analysis"""
+    total_breached_accounts: int
+    total_compromised_passwords: int
+    domains_with_breaches: int
+    highest_risk_level: str
+    most_common_data_classes: List[str]
+    recommendations: List[str]
+
+
 class BulkAnalysisResponse(BaseModel):
     """Response schema for bulk analysis"""
     total_items: int
@@ -271,32 +308,55 @@ class BulkAnalysisResponse(BaseModel):
     analysis_results: List[HaveIBeenPwnedAnalysisResponse]
     failed_items: List[Dict[str, str]] = Field(default_factory=list)
     processing_time_seconds: float
-    summary: Dict[str, Any]
 
-    @validator('summary', always=True)
-    def generate_bulk_summary(cls, v, values):
-        results = values.get('analysis_results', [])
-        
-        summary = {
-            'total_breached_accounts': sum(1 for r in results if r.account_breaches and r.account_breaches.is_breached),
-            'total_compromised_passwords': sum(1 for r in results if r.password_analysis and r.password_analysis.is_pwned),
-            'domains_with_breaches': sum(1 for r in results if r.domain_breaches and len(r.domain_breaches) > 0),
-            'highest_risk_level': 'safe',
-            'most_common_data_classes': [],
-            'recommendations': set()
-        }
+    @computed_field
+    @property
+    def summary(self) -> BulkAnalysisSummary:
+        results = self.analysis_results
+        if not results:
+            return {
+                'total_breached_accounts': 0,
+                'total_compromised_passwords': 0,
+                'domains_with_breaches': 0,
+                'highest_risk_level': 'safe',
+                'most_common_data_classes': [],
+                'recommendations': []
+            }
         
-        # Determine highest risk level
-        risk_levels = ['safe', 'low', 'medium', 'high', 'critical']
-        for result in results:
-            risk = result.summary.get('risk_level', 'safe')
-            if risk_levels.index(risk) > risk_levels.index(summary['highest_risk_level']):
-                summary['highest_risk_level'] = risk
+        breached_accounts = 0
+        compromised_passwords = 0
+        domains_with_breaches = 0
+        highest_rank: int = 0
+        recommendations = []
         
-        # Collect recommendations
+        # Single pass: counters, highest risk level and recommendations
+        risk_rank = _RISK_RANK
+        add_recommendations = recommendations.extend
         for result in results:
-            summary['recommendations'].update(result.summary.get('recommendations', []))
+            account_data = result.account_breaches
+            if account_data and account_data.is_breached:
+                breached_accounts += 1
+            password_data = result.password_analysis
+            if password_data and password_data.is_pwned:
+                compromised_passwords += 1
+            if result.domain_breaches:
+                domains_with_breaches += 1
+            
+            result_summary = result.summary
+            rank = risk_rank[result_summary.get('risk_level', 'safe')]
+            if rank > highest_rank:
+                highest_rank = rank
+            
+            add_recommendations(result_summary.get('recommendations', ()))
         
-        summary['recommendations'] = list(summary['recommendations'])
+        summary = {
+            'total_breached_accounts': breached_accounts,
+            'total_compromised_passwords': compromised_passwords,
+            'domains_with_breaches': domains_with_breaches,
+            'highest_risk_level': _RISK_LEVELS[highest_rank],
+            'most_common_data_classes': [],
+            # Deduplicate while keeping first-seen order for stable output
+            'recommendations': list(dict.fromkeys(recommendations))
+        }
         
         return summary
\ No newline at end of file
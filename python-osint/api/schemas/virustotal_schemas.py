@@ -3,9 +3,12 @@ VirusTotal API Schemas and Models
 Pydantic models for request/response validation and serialization
 """
 
-from typing import Dict, Any, List, Optional, Union
+from dataclasses import dataclass
+from functools import cached_property
+from operator import attrgetter
+from typing import Annotated, Dict, Any, List, Optional, Union, Final, Tuple
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from enum import Enum
 
 class AnalysisType(str, Enum):
@@ -60,17 +63,44 @@ class VirusTotalSearchRequest(BaseModel):
     limit: int = Field(default=10, ge=1, le=300, description="Number of results to return")
 
 # Response Models
-class EngineResult(BaseModel):
+# A report carries one EngineResult per engine (70+ for files). It is a plain
+# frozen, slotted dataclass: no per-instance __dict__, and VirusTotal payloads
+# are decoded through from_vt() without running validation. Pydantic still
+# validates and serializes it wherever it appears in a model.
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EngineResult:
     """Individual antivirus engine result"""
-    category: str = Field(..., description="Detection category")
-    engine_name: str = Field(..., description="Antivirus engine name")
-    engine_version: str = Field(None, description="Engine version")
-    result: Optional[str] = Field(None, description="Detection result")
-    method: Optional[str] = Field(None, description="Detection method")
-    engine_update: Optional[str] = Field(None, description="Engine update date")
+    category: Annotated[str, Field(description="Detection category")]
+    engine_name: Annotated[str, Field(description="Antivirus engine name")]
+    engine_version: Annotated[Optional[str], Field(description="Engine version")] = None
+    result: Annotated[Optional[str], Field(description="Detection result")] = None
+    method: Annotated[Optional[str], Field(description="Detection method")] = None
+    engine_update: Annotated[Optional[str], Field(description="Engine update date")] = None
+    
+    @classmethod
+    def from_vt(cls, data: Dict[str, Any]) -> "EngineResult":
+        """Build from a trusted last_analysis_results entry, ignoring unknown keys"""
+        get = data.get
+        return cls(
+            category=get('category'),
+            engine_name=get('engine_name'),
+            engine_version=get('engine_version'),
+            result=get('result'),
+            method=get('method'),
+            engine_update=get('engine_update')
+        )
+
+_STAT_FIELDS: Final[Tuple[str, ...]] = (
+    'harmless', 'malicious', 'suspicious', 'timeout',
+    'undetected', 'confirmed_timeout', 'failure', 'type_unsupported'
+)
+_get_stat_counts = attrgetter(*_STAT_FIELDS)
 
 class AnalysisStats(BaseModel):
     """Analysis statistics from VirusTotal"""
+    # Frozen so the cached totals below can never go stale
+    model_config = ConfigDict(frozen=True)
+    
     harmless: int = Field(default=0, description="Number of harmless verdicts")
     malicious: int = Field(default=0, description="Number of malicious verdicts")
     suspicious: int = Field(default=0, description="Number of suspicious verdicts")
@@ -80,16 +110,16 @@ class AnalysisStats(BaseModel):
     failure: int = Field(default=0, description="Number of failure verdicts")
     type_unsupported: int = Field(default=0, description="Number of type unsupported verdicts")
     
-    @property
+    @cached_property
     def total_engines(self) -> int:
         """Total number of engines that analyzed the sample"""
-        return sum([
-            self.harmless, self.malicious, self.suspicious, 
-            self.timeout, self.undetected, self.confirmed_timeout,
-            self.failure, self.type_unsupported
-        ])
+        return (
+            self.harmless + self.malicious + self.suspicious
+            + self.timeout + self.undetected + self.confirmed_timeout
+            + self.failure + self.type_unsupported
+        )
     
-    @property
+    @cached_property
     def detection_ratio(self) -> str:
         """Detection ratio as string (malicious/total)"""
         return f"{self.malicious}/{self.total_engines}"
@@ -98,6 +128,17 @@ class AnalysisStats(BaseModel):
     def is_malicious(self) -> bool:
         """Whether the sample is considered malicious"""
         return self.malicious > 0
+    
+    @classmethod
+    def _totals_bulk(cls, stats_list: List["AnalysisStats"]) -> Dict[str, int]:
+        """Per-verdict totals across many analyses, plus the overall engine count"""
+        # Read the eight counters once per sample and sum column-wise in C
+        # instead of going through total_engines on every instance
+        totals = dict.fromkeys(_STAT_FIELDS, 0)
+        if stats_list:
+            totals = dict(zip(_STAT_FIELDS, map(sum, zip(*map(_get_stat_counts, stats_list)))))
+        totals['total_engines'] = sum(totals.values())
+        return totals
 
 class FileAttributes(BaseModel):
     """File analysis attributes from VirusTotal"""
@@ -199,12 +240,6 @@ class VirusTotalAnalysisResult(BaseModel):
     reputation: Optional[int] = Field(None, description="Resource reputation score")
     permalink: Optional[str] = Field(None, description="VirusTotal permalink")
     message: Optional[str] = Field(None, description="Status message")
-    
-    @validator('analysis_date', pre=True)
-    def parse_analysis_date(cls, v):
-        if isinstance(v, int):
-            return datetime.fromtimestamp(v)
-        return v
 
 class VirusTotalBulkResult(BaseModel):
     """Bulk analysis result"""
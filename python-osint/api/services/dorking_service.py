@@ -3,13 +3,16 @@ Advanced OSINT Dorking Service
 Provides sophisticated Google dorking capabilities using predefined templates
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from api.data.dorking_templates import (
     alias_dorking_templates, 
     domain_dorking_templates,
     PRIORITY_LEVELS,
-    format_dork_template,
+    build_dork_placeholders,
     get_templates_by_priority,
     get_templates_by_category
 )
@@ -18,13 +21,328 @@ from api.clients import GoogleSearchClient, GoogleSearchAPIError
 logger = logging.getLogger(__name__)
 
 
+def _priority_rank(template: Dict[str, Any]) -> int:
+    return PRIORITY_LEVELS.get(template["priority"], 999)
+
+
+# Templates are static, so sort them by priority (high first) and collect their
+# categories once at import instead of on every request
+_PRESORTED_TEMPLATES: Dict[str, Tuple[Dict[str, Any], ...]] = {
+    "alias": tuple(sorted(alias_dorking_templates, key=_priority_rank)),
+    "domain": tuple(sorted(domain_dorking_templates, key=_priority_rank)),
+}
+
+_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "alias": tuple(sorted({t["category"] for t in alias_dorking_templates})),
+    "domain": tuple(sorted({t["category"] for t in domain_dorking_templates})),
+}
+
+# Bit position of each alias category, so the categories seen during an
+# analysis can be tracked in a plain int mask instead of a set of strings
+_ALIAS_CATEGORY_INDEX: Dict[str, int] = {c: i for i, c in enumerate(_CATEGORIES["alias"])}
+
+_TEMPLATES_INFO: Dict[str, Tuple[Dict[str, Any], ...]] = {
+    kind: tuple({
+        "category": t["category"],
+        "objective": t["objective"],
+        "description": t["description"],
+        "priority": t["priority"],
+        "template": t["dork"]
+    } for t in templates)
+    for kind, templates in (("alias", alias_dorking_templates), ("domain", domain_dorking_templates))
+}
+
+
+@lru_cache(maxsize=32)
+def _filtered_templates(
+    kind: str,
+    priority: Optional[str] = None,
+    category: Optional[str] = None
+) -> Tuple[Dict[str, Any], ...]:
+    """Priority-sorted templates of the given kind, optionally filtered"""
+    templates = _PRESORTED_TEMPLATES[kind]
+    
+    if priority:
+        templates = tuple(get_templates_by_priority(templates, priority))
+        
+    if category:
+        templates = tuple(get_templates_by_category(templates, category))
+        
+    return templates
+
+
+def _result_key(template: Dict[str, Any]) -> str:
+    return f"{template['category']}_{template['objective']}".replace(' ', '_').lower()
+
+
+@lru_cache(maxsize=32)
+def _result_keys(
+    kind: str,
+    priority: Optional[str] = None,
+    category: Optional[str] = None
+) -> Tuple[str, ...]:
+    """
+    analysis_results keys aligned with _filtered_templates(). Kept out of the
+    template dicts themselves because those are echoed back in responses.
+    """
+    return tuple(_result_key(t) for t in _filtered_templates(kind, priority, category))
+
+
+@lru_cache(maxsize=32)
+def _alias_category_bits(
+    priority: Optional[str] = None,
+    category: Optional[str] = None
+) -> Tuple[int, ...]:
+    """Category bit of each template in _filtered_templates("alias", ...)"""
+    return tuple(
+        1 << _ALIAS_CATEGORY_INDEX[t["category"]]
+        for t in _filtered_templates("alias", priority, category)
+    )
+
+
+
+def _extract_total_results(search_result: Dict[str, Any]) -> int:
+    """Total result count reported by Google, 0 when missing or malformed"""
+    try:
+        return int(search_result["searchInformation"]["totalResults"])
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+def _extract_items(search_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Returned result items, empty when Google found nothing"""
+    try:
+        return search_result["items"]
+    except KeyError:
+        return []
+
+
+def _extract_search_time(search_result: Dict[str, Any]) -> float:
+    """Search time reported by Google, 0 when missing"""
+    try:
+        return search_result["searchInformation"]["searchTime"]
+    except (KeyError, TypeError):
+        return 0
+
+
+@dataclass(slots=True)
+class _TemplateOutcome:
+    """Result of one template, reduced into the analysis summary after gather"""
+    key: str
+    success: bool
+    total_results: int = 0
+    category_bit: int = 0
+    query_result: Optional[Dict[str, Any]] = None
+    high_value_finding: Optional[Dict[str, Any]] = None
+
+
+def _alias_outcome(
+    key: str,
+    category_bit: int,
+    template: Dict[str, Any],
+    formatted_dork: Optional[str],
+    search_result: Any
+) -> _TemplateOutcome:
+    """Turn one alias template search (or its error) into an outcome"""
+    if isinstance(search_result, GoogleSearchAPIError):
+        logger.error(f"Google Search API error for template '{template['objective']}': {search_result.message}")
+        
+        return _TemplateOutcome(key, False, query_result={
+            "template": template,
+            "formatted_query": formatted_dork,
+            "status": "api_error",
+            "error": search_result.message,
+            "error_code": search_result.status_code
+        })
+    
+    if isinstance(search_result, Exception):
+        logger.error(f"Unexpected error for template '{template['objective']}': {search_result}")
+        
+        return _TemplateOutcome(key, False, query_result={
+            "template": template,
+            "formatted_query": formatted_dork,
+            "status": "error",
+            "error": str(search_result)
+        })
+    
+    # Process results
+    items = _extract_items(search_result)
+    total_results = _extract_total_results(search_result)
+    
+    query_result = {
+        "template": template,
+        "formatted_query": formatted_dork,
+        "total_results": total_results,
+        "returned_items": len(items),
+        "items": items,
+        "status": "success",
+        "search_time": _extract_search_time(search_result)
+    }
+    
+    # Mark high-value findings
+    high_value_finding = None
+    if total_results > 0 and template["priority"] == "high":
+        high_value_finding = {
+            "objective": template["objective"],
+            "category": template["category"],
+            "results_count": total_results,
+            "preview_items": items[:3]  # First 3 items for preview
+        }
+        
+    logger.info(f"Query completed: {total_results} total results, {len(items)} returned")
+    
+    return _TemplateOutcome(key, True, total_results, category_bit, query_result, high_value_finding)
+
+
+def _domain_outcome(
+    key: str,
+    template: Dict[str, Any],
+    formatted_dork: Optional[str],
+    search_result: Any
+) -> _TemplateOutcome:
+    """Turn one domain template search (or its error) into an outcome"""
+    if isinstance(search_result, Exception):
+        logger.error(f"Error in domain template '{template['objective']}': {search_result}")
+        return _TemplateOutcome(key, False)
+    
+    items = _extract_items(search_result)
+    total_results = _extract_total_results(search_result)
+    
+    query_result = {
+        "template": template,
+        "formatted_query": formatted_dork,
+        "total_results": total_results,
+        "returned_items": len(items),
+        "items": items,
+        "status": "success"
+    }
+    
+    high_value_finding = None
+    if total_results > 0 and template["priority"] == "high":
+        high_value_finding = {
+            "objective": template["objective"],
+            "category": template["category"],
+            "results_count": total_results
+        }
+    
+    return _TemplateOutcome(key, True, total_results, 0, query_result, high_value_finding)
+
+
+def _summarize(outcomes: List[_TemplateOutcome]) -> Tuple[Dict[str, Any], Dict[str, Any], int]:
+    """
+    Reduce template outcomes in one pass after all searches have finished
+    
+    Returns:
+        Tuple of (analysis_results, summary, categories bitmask)
+    """
+    successful = sum(o.success for o in outcomes)
+    categories_mask = 0
+    for o in outcomes:
+        categories_mask |= o.category_bit
+    
+    analysis_results = {o.key: o.query_result for o in outcomes if o.query_result is not None}
+    summary = {
+        "total_results_found": sum(o.total_results for o in outcomes),
+        "successful_queries": successful,
+        "failed_queries": len(outcomes) - successful,
+        "high_value_findings": [o.high_value_finding for o in outcomes if o.high_value_finding]
+    }
+    return analysis_results, summary, categories_mask
+
+
 class DorkingService:
     """
     Service for advanced OSINT dorking analysis
     """
     
-    def __init__(self, google_client: GoogleSearchClient):
+    def __init__(self, google_client: GoogleSearchClient, max_concurrency: int = 5):
         self.google_client = google_client
+        # Upper bound on in-flight Google searches per analysis (CSE QPS limits)
+        self.max_concurrency = max_concurrency
+    
+    async def _run_query(
+        self,
+        semaphore: asyncio.Semaphore,
+        query: str,
+        objective: str,
+        max_results_per_query: int
+    ) -> Any:
+        """
+        Execute a single formatted dork query
+        
+        Args:
+            semaphore: Semaphore bounding concurrent searches
+            query: The formatted dork query
+            objective: Objective of the (first) template using this query, for logging
+            max_results_per_query: Maximum results for the query
+            
+        Returns:
+            The search result. Errors are returned in its place so one
+            failure doesn't cancel the others.
+        """
+        try:
+            async with semaphore:
+                logger.info(f"Executing dork: {objective}")
+                # Skip building the message when debug logging is off
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Query: {query}")
+                
+                return await self.google_client.search(
+                    query=query,
+                    num_results=max_results_per_query
+                )
+            
+        except Exception as e:
+            return e
+    
+    async def _run_templates(
+        self,
+        templates: Tuple[Dict[str, Any], ...],
+        max_results_per_query: int,
+        placeholders: Mapping[str, str]
+    ) -> List[Tuple[Optional[str], Any]]:
+        """
+        Format every template and run the distinct queries concurrently
+        
+        Templates that format to the same query share a single search, so
+        duplicates don't spend API quota twice.
+        
+        Returns:
+            (formatted query, search result) pairs in template order
+        """
+        searches: List[Tuple[Optional[str], Any]] = []
+        unique_queries: Dict[str, List[int]] = {}
+        for index, template in enumerate(templates):
+            try:
+                query = template["dork"].format_map(placeholders)
+            except Exception as e:
+                searches.append((None, e))
+                continue
+            searches.append((query, None))
+            unique_queries.setdefault(query, []).append(index)
+        
+        if len(unique_queries) < len(templates):
+            logger.info("Deduped %d templates to %d unique queries", len(templates), len(unique_queries))
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                query: tg.create_task(self._run_query(
+                    semaphore,
+                    query,
+                    templates[indices[0]]["objective"],
+                    max_results_per_query
+                ))
+                for query, indices in unique_queries.items()
+            }
+        
+        # Fan each result back out to every template that produced the query
+        for query, indices in unique_queries.items():
+            search_result = tasks[query].result()
+            for index in indices:
+                searches[index] = (query, search_result)
+        
+        return searches
         
     async def analyze_alias_comprehensive(
         self, 
@@ -50,118 +368,39 @@ class DorkingService:
         # Clean the alias
         clean_alias = alias.lstrip('@')
         
-        # Filter templates based on parameters
-        templates = alias_dorking_templates
+        # Filtered templates, sorted by priority (high priority first)
+        templates = _filtered_templates("alias", priority_filter, category_filter)
+        keys = _result_keys("alias", priority_filter, category_filter)
+        category_bits = _alias_category_bits(priority_filter, category_filter)
         
-        if priority_filter:
-            templates = get_templates_by_priority(templates, priority_filter)
-            
-        if category_filter:
-            templates = get_templates_by_category(templates, category_filter)
-            
-        # Sort by priority (high priority first)
-        templates.sort(key=lambda x: PRIORITY_LEVELS.get(x["priority"], 999))
+        # Execute all dorking templates concurrently, bounded by the semaphore
+        placeholders = build_dork_placeholders(target_alias=alias)
+        searches = await self._run_templates(templates, max_results_per_query, placeholders)
         
-        results = {
+        # Reduce results in template order
+        analysis_results, summary, categories_mask = _summarize([
+            _alias_outcome(key, category_bit, template, formatted_dork, search_result)
+            for key, category_bit, template, (formatted_dork, search_result) in zip(
+                keys, category_bits, templates, searches
+            )
+        ])
+        
+        results: Dict[str, Any] = {
             "target_alias": alias,
             "clean_alias": clean_alias,
             "total_templates_used": len(templates),
-            "analysis_results": {},
+            "analysis_results": analysis_results,
             "summary": {
-                "total_results_found": 0,
-                "successful_queries": 0,
-                "failed_queries": 0,
-                "categories_analyzed": set(),
-                "high_value_findings": []
+                "total_results_found": summary["total_results_found"],
+                "successful_queries": summary["successful_queries"],
+                "failed_queries": summary["failed_queries"],
+                "categories_analyzed": [
+                    c for c, i in _ALIAS_CATEGORY_INDEX.items() if categories_mask & (1 << i)
+                ],
+                "high_value_findings": summary["high_value_findings"]
             }
         }
         
-        # Execute each dorking template
-        for i, template in enumerate(templates):
-            try:
-                # Format the dork query
-                formatted_dork = format_dork_template(
-                    template, 
-                    target_alias=alias,
-                    target_domain=None,
-                    target_company=None
-                )
-                
-                logger.info(f"Executing dork {i+1}/{len(templates)}: {template['objective']}")
-                logger.debug(f"Query: {formatted_dork}")
-                
-                # Execute the search
-                search_result = await self.google_client.search(
-                    query=formatted_dork,
-                    num_results=max_results_per_query
-                )
-                
-                # Process results
-                items = search_result.get('items', [])
-                total_results = int(search_result.get('searchInformation', {}).get('totalResults', '0'))
-                
-                query_result = {
-                    "template": template,
-                    "formatted_query": formatted_dork,
-                    "total_results": total_results,
-                    "returned_items": len(items),
-                    "items": items,
-                    "status": "success",
-                    "search_time": search_result.get('searchInformation', {}).get('searchTime', 0)
-                }
-                
-                # Store result
-                key = f"{template['category']}_{template['objective']}".replace(' ', '_').lower()
-                results["analysis_results"][key] = query_result
-                
-                # Update summary
-                results["summary"]["total_results_found"] += total_results
-                results["summary"]["successful_queries"] += 1
-                results["summary"]["categories_analyzed"].add(template["category"])
-                
-                # Mark high-value findings
-                if total_results > 0 and template["priority"] == "high":
-                    results["summary"]["high_value_findings"].append({
-                        "objective": template["objective"],
-                        "category": template["category"],
-                        "results_count": total_results,
-                        "preview_items": items[:3]  # First 3 items for preview
-                    })
-                    
-                logger.info(f"Query completed: {total_results} total results, {len(items)} returned")
-                
-            except GoogleSearchAPIError as e:
-                logger.error(f"Google Search API error for template '{template['objective']}': {e.message}")
-                
-                error_result = {
-                    "template": template,
-                    "formatted_query": formatted_dork,
-                    "status": "api_error",
-                    "error": e.message,
-                    "error_code": e.status_code
-                }
-                
-                key = f"{template['category']}_{template['objective']}".replace(' ', '_').lower()
-                results["analysis_results"][key] = error_result
-                results["summary"]["failed_queries"] += 1
-                
-            except Exception as e:
-                logger.error(f"Unexpected error for template '{template['objective']}': {e}")
-                
-                error_result = {
-                    "template": template,
-                    "formatted_query": formatted_dork,
-                    "status": "error",
-                    "error": str(e)
-                }
-                
-                key = f"{template['category']}_{template['objective']}".replace(' ', '_').lower()
-                results["analysis_results"][key] = error_result
-                results["summary"]["failed_queries"] += 1
-        
-        # Convert set to list for JSON serialization
-        results["summary"]["categories_analyzed"] = list(results["summary"]["categories_analyzed"])
-        
         logger.info(f"Comprehensive analysis completed. {results['summary']['successful_queries']} successful queries, {results['summary']['total_results_found']} total results found")
         
         return results
@@ -185,87 +424,30 @@ class DorkingService:
         """
         logger.info(f"Starting comprehensive domain analysis for: {domain}")
         
-        # Filter templates based on parameters
-        templates = domain_dorking_templates
+        # Filtered templates, sorted by priority
+        templates = _filtered_templates("domain", priority_filter)
+        keys = _result_keys("domain", priority_filter)
         
-        if priority_filter:
-            templates = get_templates_by_priority(templates, priority_filter)
-            
-        # Sort by priority
-        templates.sort(key=lambda x: PRIORITY_LEVELS.get(x["priority"], 999))
+        # Execute all templates concurrently, bounded by the semaphore
+        placeholders = build_dork_placeholders(target_domain=domain)
+        searches = await self._run_templates(templates, max_results_per_query, placeholders)
+        
+        analysis_results, summary, _ = _summarize([
+            _domain_outcome(key, template, formatted_dork, search_result)
+            for key, template, (formatted_dork, search_result) in zip(keys, templates, searches)
+        ])
         
-        results = {
+        return {
             "target_domain": domain,
             "total_templates_used": len(templates),
-            "analysis_results": {},
-            "summary": {
-                "total_results_found": 0,
-                "successful_queries": 0,
-                "failed_queries": 0,
-                "high_value_findings": []
-            }
+            "analysis_results": analysis_results,
+            "summary": summary
         }
-        
-        # Execute each template
-        for template in templates:
-            try:
-                formatted_dork = format_dork_template(
-                    template,
-                    target_domain=domain
-                )
-                
-                search_result = await self.google_client.search(
-                    query=formatted_dork,
-                    num_results=max_results_per_query
-                )
-                
-                items = search_result.get('items', [])
-                total_results = int(search_result.get('searchInformation', {}).get('totalResults', '0'))
-                
-                query_result = {
-                    "template": template,
-                    "formatted_query": formatted_dork,
-                    "total_results": total_results,
-                    "returned_items": len(items),
-                    "items": items,
-                    "status": "success"
-                }
-                
-                key = f"{template['category']}_{template['objective']}".replace(' ', '_').lower()
-                results["analysis_results"][key] = query_result
-                
-                results["summary"]["total_results_found"] += total_results
-                results["summary"]["successful_queries"] += 1
-                
-                if total_results > 0 and template["priority"] == "high":
-                    results["summary"]["high_value_findings"].append({
-                        "objective": template["objective"],
-                        "category": template["category"],
-                        "results_count": total_results
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error in domain template '{template['objective']}': {e}")
-                results["summary"]["failed_queries"] += 1
-        
-        return results
     
     def get_available_categories(self, target_type: str = "alias") -> List[str]:
         """Get available categories for a target type"""
-        if target_type == "alias":
-            return list(set(t["category"] for t in alias_dorking_templates))
-        elif target_type == "domain":
-            return list(set(t["category"] for t in domain_dorking_templates))
-        return []
+        return list(_CATEGORIES.get(target_type, ()))
     
     def get_templates_info(self, target_type: str = "alias") -> List[Dict[str, Any]]:
         """Get information about available templates"""
-        templates = alias_dorking_templates if target_type == "alias" else domain_dorking_templates
-        
-        return [{
-            "category": t["category"],
-            "objective": t["objective"],
-            "description": t["description"],
-            "priority": t["priority"],
-            "template": t["dork"]
-        } for t in templates]
\ No newline at end of file
+        return list(_TEMPLATES_INFO["alias" if target_type == "alias" else "domain"])
@@ -32,4 +32,4 @@ except Exception as e:
     print(f"❌ Import failed at step: {str(e)}")
     print("\nFull traceback:")
     traceback.print_exc()
-    sys.exit(1)
\ No newline at end of file
+    sys.exit(1)
@@ -3,28 +3,39 @@
 Health check script for Docker container
 """
 
-import requests
+import http.client
+import json
 import sys
 import time
 
 def check_health():
     """Check if the FastAPI service is healthy"""
     max_attempts = 3
+    # One keep-alive connection shared by every attempt; stdlib only so the
+    # probe doesn't pay for importing requests each time Docker runs it
+    conn = http.client.HTTPConnection('localhost', 8001, timeout=10)
     
-    for attempt in range(max_attempts):
-        try:
-            response = requests.get('http://localhost:8001/health', timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'healthy':
-                    print("Service is healthy")
-                    return True
-            print(f"Health check failed: {response.status_code}")
-        except Exception as e:
-            print(f"Health check attempt {attempt + 1} failed: {e}")
-            
-        if attempt < max_attempts - 1:
-            time.sleep(2)
+    try:
+        for attempt in range(max_attempts):
+            try:
+                conn.request('GET', '/health')
+                response = conn.getresponse()
+                body = response.read()
+                if response.status == 200:
+                    data = json.loads(body)
+                    if data.get('status') == 'healthy':
+                        print("Service is healthy")
+                        return True
+                print(f"Health check failed: {response.status}")
+            except Exception as e:
+                print(f"Health check attempt {attempt + 1} failed: {e}")
+                # Drop the broken socket; the next request reconnects
+                conn.close()
+                
+            if attempt < max_attempts - 1:
+                time.sleep(2)
+    finally:
+        conn.close()
     
     return False
 
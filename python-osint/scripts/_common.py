@@ -0,0 +1,322 @@
+"""
+Shared helpers for the OSINT analysis scripts: DNS resolution, HTTP
+sessions, API rate limiting and lookup caching
+"""
+
+import asyncio
+import functools
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import aiohttp
+import dns.asyncresolver
+import dns.resolver
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import ThreadedResolver
+
+_resolver = None
+EDNS_PAYLOAD = 4096
+
+def get_resolver() -> dns.asyncresolver.Resolver:
+    """
+    Process-wide resolver, created on first use: /etc/resolv.conf is read
+    once and answers (including NS/glue) are reused from an LRU cache
+    """
+    global _resolver
+    if _resolver is None:
+        _resolver = dns.asyncresolver.Resolver()
+        _resolver.cache = dns.resolver.LRUCache(10000)
+        _resolver.lifetime = 5.0
+        # Advertise a 4096-byte EDNS0 buffer so long TXT/MX sets fit in one
+        # UDP reply instead of being truncated and retried over TCP
+        _resolver.use_edns(0, 0, EDNS_PAYLOAD)
+    return _resolver
+
+class CachedResolver(AbstractResolver):
+    """
+    aiohttp resolver that looks hostnames up through the shared dnspython
+    resolver, so lookups need no getaddrinfo worker thread and repeat answers
+    come from its LRU cache. Names it can't answer (hosts-file entries,
+    IPv6-only lookups) go through aiohttp's default resolver
+    """
+    
+    def __init__(self):
+        self._fallback = ThreadedResolver()
+    
+    async def resolve(self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET):
+        if family != socket.AF_INET6:
+            try:
+                answer = await get_resolver().resolve(host, 'A')
+            except Exception:
+                pass
+            else:
+                return [
+                    {
+                        'hostname': host,
+                        'host': rdata.address,
+                        'port': port,
+                        'family': socket.AF_INET,
+                        'proto': 0,
+                        'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+                    }
+                    for rdata in answer
+                ]
+        return await self._fallback.resolve(host, port, family)
+    
+    async def close(self):
+        await self._fallback.close()
+
+def create_session(limit: int = 20, limit_per_host: int = 0, ttl_dns_cache: int = 3600) -> aiohttp.ClientSession:
+    """
+    HTTP session shared by every request of one analysis run, so calls to
+    the same host reuse pooled keep-alive connections and cached DNS
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            ttl_dns_cache=ttl_dns_cache,
+            resolver=CachedResolver()
+        )
+    )
+
+# One long-lived session per event loop, for requests no single caller owns,
+# kept with the suspended generator that closes it
+_shared_sessions = weakref.WeakKeyDictionary()
+
+async def _session_keeper(session: aiohttp.ClientSession):
+    try:
+        yield session
+    finally:
+        await session.close()
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Session living as long as the running event loop. It is closed when the
+    loop shuts down its async generators (asyncio.run() does on exit)
+    """
+    loop = asyncio.get_running_loop()
+    shared = _shared_sessions.get(loop)
+    if shared is None or shared[0].closed:
+        keeper = _session_keeper(create_session())
+        shared = _shared_sessions[loop] = (await keeper.__anext__(), keeper)
+    return shared[0]
+
+async def with_session(func, *args):
+    """Run an async lookup on a fresh session (for the sync wrappers)"""
+    async with create_session() as session:
+        return await func(*args, session)
+
+def evaluate_threat_rules(rules: Sequence[Tuple], features: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Score features against a script's THREAT_RULES. Rules are (feature,
+    comparison, tiers); the tiers of a rule are tried in order and the first
+    (threshold, points, factor) that matches the feature value is applied.
+    Missing features are skipped
+    """
+    score = 0
+    factors = []
+    
+    for feature, compare, tiers in rules:
+        value = features.get(feature)
+        if value is None:
+            continue
+        for threshold, points, factor in tiers:
+            if compare(value, threshold):
+                score += points
+                factors.append(factor.format(value))
+                break
+    
+    # Determine threat level
+    if score >= 60:
+        level = 'high'
+    elif score >= 30:
+        level = 'medium'
+    elif score > 0:
+        level = 'low'
+    else:
+        level = 'clean'
+    
+    return {
+        'score': score,
+        'level': level,
+        'factors': factors
+    }
+
+class QuotaExhausted(Exception):
+    """Raised instead of waiting out a long API quota window"""
+
+class RateLimiter:
+    """
+    Sliding-window limiter allowing at most max_rate requests per period
+    seconds. Slots are reserved without awaiting, so concurrent callers
+    queue up in order and no lock is needed. When the wait for a slot would
+    exceed max_wait seconds, QuotaExhausted is raised instead of sleeping
+    """
+    
+    def __init__(self, name: str, max_rate: int, period: float, max_wait: Optional[float] = None):
+        self.name = name
+        self.period = period
+        self.max_wait = max_wait
+        self._starts = deque(maxlen=max_rate)
+    
+    async def __aenter__(self):
+        now = time.monotonic()
+        start = now
+        if len(self._starts) == self._starts.maxlen:
+            start = max(now, self._starts[0] + self.period)
+            if self.max_wait is not None and start - now > self.max_wait:
+                raise QuotaExhausted(f'{self.name} quota exhausted')
+        self._starts.append(start)
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+# Longest wait for a slot of a daily or monthly quota. Those windows take
+# hours to free up, so lookups past the quota fail fast instead of holding
+# an analysis (and its batch slot) open
+QUOTA_MAX_WAIT = 5
+
+# Quotas shared by every script using the same API key: VirusTotal's free
+# 4 req/min is waited out, URLVoid's monthly allowance is not. Counts are
+# per process, so they cover bulk runs and the API's in-process analyses
+VT_LIMITER = RateLimiter('VirusTotal', 4, 60)
+URLVOID_LIMITER = RateLimiter('URLVoid', 1000, 30 * 86400, max_wait=QUOTA_MAX_WAIT)
+
+# VirusTotal answers are kept in memory for an hour and concurrent lookups of
+# the same target share one request, so bulk runs spend the free 4 req/min
+# quota once per target
+VT_CACHE_TTL = 3600
+
+# Third-party lookups are kept on disk and shared across runs (each CLI
+# analysis is its own process), saving scarce free-tier API quota. Expired
+# answers are still served for a while if the upstream API fails
+DISK_CACHE_TTL = 86400
+DISK_CACHE_MAX_STALE = 7 * 86400
+DISK_CACHE_PATH = os.path.join(
+    os.path.expanduser(os.getenv('OSINT_CACHE_DIR', '~/.cache/sourceweaver')),
+    'analysis_cache.sqlite3'
+)
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+def _get_disk_cache() -> sqlite3.Connection:
+    """Open the shared cache database on first use"""
+    global _disk_cache
+    if _disk_cache is None:
+        os.makedirs(os.path.dirname(DISK_CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(DISK_CACHE_PATH, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value TEXT)')
+        _disk_cache = conn
+    return _disk_cache
+
+def _read_disk_cache(cache_key: str) -> Optional[Tuple[float, str]]:
+    """(expires, value) row stored under cache_key, if any"""
+    with _disk_cache_lock:
+        return _get_disk_cache().execute(
+            'SELECT expires, value FROM cache WHERE key = ?', (cache_key,)
+        ).fetchone()
+
+def _write_disk_cache(cache_key: str, expires: float, value: str):
+    with _disk_cache_lock:
+        _get_disk_cache().execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', (cache_key, expires, value))
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """Only complete answers are cached, never errors or empty results"""
+    return bool(result) and 'error' not in result and not any(
+        isinstance(value, dict) and 'error' in value for value in result.values()
+    )
+
+def disk_cached(*, namespace: str, ttl: int = DISK_CACHE_TTL, key: Optional[Callable[[str], Optional[str]]] = None):
+    """
+    Memoize an async (target, session) lookup in the disk cache under
+    namespace:key(target) (the target itself by default) for ttl seconds;
+    targets keyed to None are not cached and force_refresh=True skips a
+    fresh entry. All scripts share one table, so each lookup needs its own
+    namespace. When the lookup fails, an expired entry is returned instead,
+    tagged with '_stale': True. The cache is best effort: if it can't be
+    opened or written, lookups go to the network. SQLite calls run in a
+    worker thread so they never block the event loop
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(target: str, session: aiohttp.ClientSession, force_refresh: bool = False) -> Dict[str, Any]:
+            cache_id = key(target) if key else target
+            if cache_id is None:
+                return await func(target, session)
+            
+            cache_key = f'{namespace}:{cache_id}'
+            row = None
+            try:
+                row = await asyncio.to_thread(_read_disk_cache, cache_key)
+            except (OSError, sqlite3.Error):
+                pass
+            now = time.time()
+            if row and row[0] > now and not force_refresh:
+                return json.loads(row[1])
+            
+            result = await func(target, session)
+            if _is_cacheable(result):
+                try:
+                    await asyncio.to_thread(_write_disk_cache, cache_key, now + ttl, json.dumps(result))
+                except (OSError, sqlite3.Error):
+                    pass
+            elif row and row[0] + DISK_CACHE_MAX_STALE > now:
+                result = json.loads(row[1])
+                result['_stale'] = True
+            return result
+        return wrapper
+    return decorator
+
+def coalesced(ttl: float, max_entries: int = 10000):
+    """
+    Keep an async (target, session) lookup's answers in memory for ttl
+    seconds, and let concurrent lookups of the same target share one
+    request, so bulk runs spend scarce API quota once per target. At most
+    max_entries answers are kept, dropping expired ones and then the oldest.
+    The shared request runs on the event loop's long-lived session and is
+    shielded from cancellation: a caller's session may be closed, or the
+    caller cancelled, while other callers still wait on the result
+    """
+    def decorator(func):
+        cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        pending: Dict[str, asyncio.Task] = {}
+        
+        async def fetch(target: str) -> Dict[str, Any]:
+            return await func(target, await get_shared_session())
+        
+        def store(target: str, result: Dict[str, Any]):
+            now = time.monotonic()
+            if len(cache) >= max_entries:
+                for expired in [key for key, (expires, _) in cache.items() if expires <= now]:
+                    del cache[expired]
+            while len(cache) >= max_entries:
+                del cache[next(iter(cache))]
+            cache[target] = (now + ttl, result)
+        
+        @functools.wraps(func)
+        async def wrapper(target: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+            cached = cache.get(target)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            
+            task = pending.get(target)
+            if task is None:
+                task = pending[target] = asyncio.ensure_future(fetch(target))
+                task.add_done_callback(lambda _: pending.pop(target, None))
+            result = await asyncio.shield(task)
+            
+            if 'error' not in result:
+                store(target, result)
+            return result
+        return wrapper
+    return decorator
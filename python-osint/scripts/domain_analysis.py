@@ -6,45 +6,127 @@ Based on TFM requirements for domain intelligence gathering
 
 import sys
 import json
-import requests
-import socket
+import operator
+import orjson
+import asyncio
+import aiohttp
+import ssl
 import argparse
+import dns.asyncquery
+import dns.asyncresolver
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
 import dns.resolver
 import whois
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from _common import (
+    EDNS_PAYLOAD, URLVOID_LIMITER, VT_CACHE_TTL, VT_LIMITER, coalesced, create_session,
+    disk_cached, evaluate_threat_rules, get_resolver, with_session
+)
+
 def analyze_domain(domain: str) -> Dict[str, Any]:
     """
     Comprehensive domain analysis using multiple sources
     """
+    return asyncio.run(analyze_domain_async(domain))
+
+async def analyze_domain_async(domain: str) -> Dict[str, Any]:
+    """
+    Comprehensive domain analysis, running every source concurrently
+    """
+    now = datetime.now()
+    async with create_session() as session:
+        (dns_records, subdomains), (whois_info, creation), reputation, ssl_info, threat_intelligence = await asyncio.gather(
+            _resolve_domain(domain),
+            _lookup_whois_async(domain),
+            get_reputation_async(domain, session),
+            get_ssl_info_async(domain),
+            get_threat_intelligence_async(domain, session)
+        )
+    
     results = {
         'domain': domain,
-        'dns_records': get_dns_records(domain),
-        'whois_info': get_whois_info(domain),
-        'reputation': get_reputation(domain),
-        'subdomains': find_subdomains(domain),
-        'ssl_info': get_ssl_info(domain),
-        'threat_intelligence': get_threat_intelligence(domain)
+        'dns_records': dns_records,
+        'whois_info': whois_info,
+        'reputation': reputation,
+        'subdomains': subdomains,
+        'ssl_info': ssl_info,
+        'threat_intelligence': threat_intelligence
     }
     
     # Calculate threat score
-    results['threat_score'] = calculate_threat_score(results)
+    results['threat_score'] = calculate_threat_score(results, now, creation)
     
     return results
 
+async def _resolve_domain(domain: str):
+    """
+    Run the DNS record and subdomain lookups together on one shared resolver
+    """
+    resolver = get_resolver()
+    return await asyncio.gather(
+        get_dns_records_async(domain, resolver),
+        find_subdomains_async(domain, resolver)
+    )
+
 def get_dns_records(domain: str) -> Dict[str, Any]:
     """
     Get comprehensive DNS records for domain
     """
+    return asyncio.run(get_dns_records_async(domain))
+
+# Record types reported by get_dns_records, in output order
+RECORD_TYPES = ('A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS', 'SOA')
+
+async def get_dns_records_async(domain: str, resolver: dns.asyncresolver.Resolver = None) -> Dict[str, Any]:
+    """
+    Get comprehensive DNS records for domain. NS comes from the recursive
+    resolver once; the other types are then asked of one of the domain's
+    authoritative servers directly, all concurrently. SOA is taken from
+    those answers when possible
+    """
     records = {}
+    resolver = resolver or get_resolver()
+    
+    try:
+        ns_answer = await resolver.resolve(domain, 'NS')
+        nameserver = await _nameserver_address(ns_answer, resolver)
+    except Exception as e:
+        ns_answer = e
+        nameserver = None
+    
+    direct_types = [record_type for record_type in RECORD_TYPES if record_type not in ('NS', 'SOA')]
+    results = await asyncio.gather(
+        *(_query_records(domain, record_type, resolver, nameserver) for record_type in direct_types),
+        return_exceptions=True
+    )
+    answers_by_type = dict(zip(direct_types, results))
+    answers_by_type['NS'] = ns_answer
     
-    record_types = ['A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS', 'SOA']
+    # No-data answers carry the zone's SOA in their authority section (a zone
+    # apex never has a CNAME), so SOA is only queried when none of them did
+    soa_answer = _authority_soa(results, dns.name.from_text(domain))
+    if soa_answer is None:
+        try:
+            soa_answer = await _query_records(domain, 'SOA', resolver, nameserver)
+        except Exception as e:
+            soa_answer = e
+    answers_by_type['SOA'] = soa_answer
     
-    for record_type in record_types:
+    for record_type in RECORD_TYPES:
+        answers = answers_by_type[record_type]
         try:
-            answers = dns.resolver.resolve(domain, record_type)
+            if isinstance(answers, Exception):
+                raise answers
+            
             records[record_type] = []
             
             for answer in answers:
@@ -67,41 +149,135 @@ def get_dns_records(domain: str) -> Dict[str, Any]:
     
     return records
 
+def _authority_soa(answers: List[Any], qname: dns.name.Name):
+    """
+    SOA record set for qname from the authority section of a no-data
+    answer, if one carried it
+    """
+    for answer in answers:
+        if isinstance(answer, dns.resolver.NoAnswer):
+            response = answer.kwargs.get('response')
+            if response is not None:
+                rrset = response.get_rrset(response.authority, qname, dns.rdataclass.IN, dns.rdatatype.SOA)
+                if rrset is not None:
+                    return rrset
+    return None
+
+async def _nameserver_address(ns_answer, resolver: dns.asyncresolver.Resolver) -> Optional[str]:
+    """
+    Address of the first authoritative nameserver that resolves, if any
+    """
+    for ns in ns_answer:
+        try:
+            return str((await resolver.resolve(ns.target, 'A'))[0])
+        except Exception:
+            continue
+    return None
+
+async def _query_records(domain: str, record_type: str, resolver: dns.asyncresolver.Resolver, nameserver: Optional[str]):
+    """
+    Look up one record type on the authoritative nameserver. Anything it
+    can't answer definitively (CNAMEs to chase, referrals, failures) goes
+    through the recursive resolver as before
+    """
+    if nameserver is not None:
+        query = dns.message.make_query(domain, record_type, use_edns=0, payload=EDNS_PAYLOAD)
+        qname = query.question[0].name
+        try:
+            response, _ = await dns.asyncquery.udp_with_fallback(query, nameserver, timeout=3)
+        except Exception:
+            response = None
+        
+        if response is not None and response.flags & dns.flags.AA:
+            rcode = response.rcode()
+            if rcode == dns.rcode.NXDOMAIN:
+                raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+            if rcode == dns.rcode.NOERROR:
+                rdtype = dns.rdatatype.from_text(record_type)
+                rrset = response.get_rrset(response.answer, qname, dns.rdataclass.IN, rdtype)
+                if rrset is not None:
+                    return rrset
+                if not response.answer:
+                    raise dns.resolver.NoAnswer(response=response)
+    
+    return await resolver.resolve(domain, record_type)
+
+# python-whois blocks on its port 43 queries, so lookups run on a shared,
+# bounded pool alongside the DNS and HTTP fan-out
+_WHOIS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='whois')
+
 def get_whois_info(domain: str) -> Dict[str, Any]:
     """
     Get WHOIS information for domain
     """
     try:
-        w = whois.whois(domain)
-        
-        # Convert datetime objects to strings for JSON serialization
-        creation_date = w.creation_date
-        if isinstance(creation_date, list):
-            creation_date = creation_date[0] if creation_date else None
-        if creation_date:
-            creation_date = creation_date.isoformat() if isinstance(creation_date, datetime) else str(creation_date)
-        
-        expiration_date = w.expiration_date
-        if isinstance(expiration_date, list):
-            expiration_date = expiration_date[0] if expiration_date else None
-        if expiration_date:
-            expiration_date = expiration_date.isoformat() if isinstance(expiration_date, datetime) else str(expiration_date)
-        
-        return {
-            'registrar': w.registrar,
-            'creation_date': creation_date,
-            'expiration_date': expiration_date,
-            'name_servers': w.name_servers if isinstance(w.name_servers, list) else [w.name_servers] if w.name_servers else [],
-            'status': w.status if isinstance(w.status, list) else [w.status] if w.status else [],
-            'emails': w.emails if isinstance(w.emails, list) else [w.emails] if w.emails else [],
-            'country': w.country,
-            'org': w.org
-        }
-        
+        return _format_whois(whois.whois(domain))[0]
     except Exception as e:
         return {'error': str(e)}
 
+async def get_whois_info_async(domain: str) -> Dict[str, Any]:
+    """
+    Get WHOIS information for domain without blocking the event loop
+    """
+    return (await _lookup_whois_async(domain))[0]
+
+async def _lookup_whois_async(domain: str) -> Tuple[Dict[str, Any], Optional[datetime]]:
+    """
+    WHOIS lookup returning the reported fields and the parsed creation date
+    (naive), which scoring uses without reparsing the ISO string
+    """
+    try:
+        w = await asyncio.get_running_loop().run_in_executor(_WHOIS_POOL, whois.whois, domain)
+        return _format_whois(w)
+    except Exception as e:
+        return {'error': str(e)}, None
+
+def _as_list(value) -> List[Any]:
+    """
+    python-whois returns a single value or a list for multi-valued fields
+    """
+    if not value:
+        return []
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+def _format_whois(w) -> Tuple[Dict[str, Any], Optional[datetime]]:
+    """
+    Normalize a python-whois record into the reported fields, along with
+    the creation date as a naive datetime when WHOIS gave one
+    """
+    # Convert datetime objects to strings for JSON serialization
+    creation_date = w.creation_date
+    if isinstance(creation_date, list):
+        creation_date = creation_date[0] if creation_date else None
+    creation_dt = creation_date.replace(tzinfo=None) if isinstance(creation_date, datetime) else None
+    if creation_date:
+        creation_date = creation_date.isoformat() if isinstance(creation_date, datetime) else str(creation_date)
+    
+    expiration_date = w.expiration_date
+    if isinstance(expiration_date, list):
+        expiration_date = expiration_date[0] if expiration_date else None
+    if expiration_date:
+        expiration_date = expiration_date.isoformat() if isinstance(expiration_date, datetime) else str(expiration_date)
+    
+    return {
+        'registrar': w.registrar,
+        'creation_date': creation_date,
+        'expiration_date': expiration_date,
+        'name_servers': _as_list(w.name_servers),
+        'status': _as_list(w.status),
+        'emails': _as_list(w.emails),
+        'country': w.country,
+        'org': w.org
+    }, creation_dt
+
 def get_reputation(domain: str) -> Dict[str, Any]:
+    """
+    Check domain reputation using multiple sources
+    """
+    return asyncio.run(with_session(get_reputation_async, domain))
+
+@disk_cached(namespace='urlvoid_domain')
+async def get_reputation_async(domain: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Check domain reputation using multiple sources
     """
@@ -113,92 +289,129 @@ def get_reputation(domain: str) -> Dict[str, Any]:
     
     if urlvoid_key and urlvoid_id:
         try:
-            response = requests.get(
+            async with URLVOID_LIMITER, session.get(
                 f'http://api.urlvoid.com/api1000/{urlvoid_id}/host/{domain}',
                 params={'key': urlvoid_key},
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                detections = data.get('detections', {})
-                engines = detections.get('engines', [])
-                
-                detected = sum(1 for engine in engines if engine.get('detected', False))
-                total = len(engines)
-                
-                reputation['urlvoid'] = {
-                    'detected_engines': detected,
-                    'total_engines': total,
-                    'detection_ratio': (detected / total * 100) if total > 0 else 0,
-                    'engines': engines
-                }
-            else:
-                reputation['urlvoid'] = {'error': f'API request failed: {response.status_code}'}
+                timeout=aiohttp.ClientTimeout(total=15)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    detections = data.get('detections', {})
+                    engines = detections.get('engines', [])
+                    
+                    detected = sum(1 for engine in engines if engine.get('detected', False))
+                    total = len(engines)
+                    
+                    reputation['urlvoid'] = {
+                        'detected_engines': detected,
+                        'total_engines': total,
+                        'detection_ratio': (detected / total * 100) if total > 0 else 0,
+                        'engines': engines
+                    }
+                else:
+                    reputation['urlvoid'] = {'error': f'API request failed: {response.status}'}
                 
         except Exception as e:
             reputation['urlvoid'] = {'error': str(e)}
     
     return reputation
 
+# Prefixes probed by find_subdomains
+COMMON_SUBDOMAINS = (
+    'www', 'mail', 'ftp', 'admin', 'blog', 'dev', 'test', 'api',
+    'staging', 'secure', 'shop', 'news', 'support', 'forum',
+    'cdn', 'static', 'assets', 'img', 'images', 'video'
+)
+
 def find_subdomains(domain: str) -> Dict[str, Any]:
     """
     Find subdomains using common prefixes and DNS enumeration
     """
-    common_subdomains = [
-        'www', 'mail', 'ftp', 'admin', 'blog', 'dev', 'test', 'api',
-        'staging', 'secure', 'shop', 'news', 'support', 'forum',
-        'cdn', 'static', 'assets', 'img', 'images', 'video'
-    ]
-    
-    found_subdomains = []
+    return asyncio.run(find_subdomains_async(domain))
+
+async def find_subdomains_async(
+    domain: str,
+    resolver: dns.asyncresolver.Resolver = None,
+    max_concurrency: int = 10
+) -> Dict[str, Any]:
+    """
+    Find subdomains using common prefixes, resolving candidates concurrently
+    """
+    resolver = resolver or get_resolver()
+    # Bound in-flight queries so the recursive resolver isn't flooded
+    semaphore = asyncio.Semaphore(max_concurrency)
     
-    for sub in common_subdomains:
+    async def resolve_subdomain(sub: str):
         subdomain = f"{sub}.{domain}"
-        try:
-            answers = dns.resolver.resolve(subdomain, 'A')
-            ips = [str(answer) for answer in answers]
-            found_subdomains.append({
-                'subdomain': subdomain,
-                'ips': ips
-            })
-        except:
-            continue
+        async with semaphore:
+            answers = await resolver.resolve(subdomain, 'A')
+        return {
+            'subdomain': subdomain,
+            'ips': [str(answer) for answer in answers]
+        }
+    
+    results = await asyncio.gather(
+        *(resolve_subdomain(sub) for sub in COMMON_SUBDOMAINS),
+        return_exceptions=True
+    )
+    found_subdomains = [result for result in results if not isinstance(result, BaseException)]
     
     return {
         'found': len(found_subdomains),
         'subdomains': found_subdomains
     }
 
+def _flatten_rdns(rdns) -> Dict[str, str]:
+    """
+    Flatten getpeercert()'s tuple of RDNs (each a tuple of (name, value)
+    pairs) into one attribute dict in a single pass
+    """
+    return {name: value for rdn in rdns for name, value in rdn}
+
 def get_ssl_info(domain: str) -> Dict[str, Any]:
     """
     Get SSL certificate information
     """
+    return asyncio.run(get_ssl_info_async(domain))
+
+async def get_ssl_info_async(domain: str) -> Dict[str, Any]:
+    """
+    Get SSL certificate information without blocking the event loop
+    """
     try:
-        import ssl
-        import socket
-        from datetime import datetime
-        
         context = ssl.create_default_context()
         
-        with socket.create_connection((domain, 443), timeout=10) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-                
-                return {
-                    'subject': dict(x[0] for x in cert.get('subject', [])),
-                    'issuer': dict(x[0] for x in cert.get('issuer', [])),
-                    'version': cert.get('version'),
-                    'serial_number': cert.get('serialNumber'),
-                    'not_before': cert.get('notBefore'),
-                    'not_after': cert.get('notAfter'),
-                    'san': cert.get('subjectAltName', [])
-                }
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(domain, 443, ssl=context, server_hostname=domain),
+            timeout=10
+        )
+        try:
+            cert = writer.get_extra_info('ssl_object').getpeercert()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        
+        return {
+            'subject': _flatten_rdns(cert.get('subject', ())),
+            'issuer': _flatten_rdns(cert.get('issuer', ())),
+            'version': cert.get('version'),
+            'serial_number': cert.get('serialNumber'),
+            'not_before': cert.get('notBefore'),
+            'not_after': cert.get('notAfter'),
+            'san': cert.get('subjectAltName', [])
+        }
                 
     except Exception as e:
         return {'error': str(e)}
 
 def get_threat_intelligence(domain: str) -> Dict[str, Any]:
+    """
+    Get threat intelligence using VirusTotal (if API key available)
+    """
+    return asyncio.run(with_session(get_threat_intelligence_async, domain))
+
+@coalesced(VT_CACHE_TTL)
+async def get_threat_intelligence_async(domain: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Get threat intelligence using VirusTotal (if API key available)
     """
@@ -210,103 +423,97 @@ def get_threat_intelligence(domain: str) -> Dict[str, Any]:
     try:
         headers = {'X-Apikey': api_key}
         
-        response = requests.get(
+        async with VT_LIMITER, session.get(
             f'https://www.virustotal.com/api/v3/domains/{domain}',
             headers=headers,
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            data = response.json()['data']['attributes']
-            stats = data.get('last_analysis_stats', {})
-            
-            return {
-                'malicious': stats.get('malicious', 0),
-                'suspicious': stats.get('suspicious', 0),
-                'clean': stats.get('harmless', 0),
-                'undetected': stats.get('undetected', 0),
-                'reputation': data.get('reputation', 0),
-                'categories': data.get('categories', {}),
-                'creation_date': data.get('creation_date'),
-                'registrar': data.get('registrar')
-            }
-        else:
-            return {'error': f'VirusTotal API request failed: {response.status_code}'}
+            timeout=aiohttp.ClientTimeout(total=15)
+        ) as response:
+            if response.status == 200:
+                data = (await response.json(content_type=None))['data']['attributes']
+                stats = data.get('last_analysis_stats', {})
+                
+                return {
+                    'malicious': stats.get('malicious', 0),
+                    'suspicious': stats.get('suspicious', 0),
+                    'clean': stats.get('harmless', 0),
+                    'undetected': stats.get('undetected', 0),
+                    'reputation': data.get('reputation', 0),
+                    'categories': data.get('categories', {}),
+                    'creation_date': data.get('creation_date'),
+                    'registrar': data.get('registrar')
+                }
+            else:
+                return {'error': f'VirusTotal API request failed: {response.status}'}
             
     except Exception as e:
         return {'error': str(e)}
 
-def calculate_threat_score(results: Dict[str, Any]) -> Dict[str, Any]:
+# Threat-score rules, scored by _common.evaluate_threat_rules
+THREAT_RULES = (
+    ('vt_malicious', operator.gt, (
+        (5, 40, '{} malicious detections'),
+        (0, 20, '{} malicious detections'),
+    )),
+    ('vt_suspicious', operator.gt, (
+        (3, 15, '{} suspicious detections'),
+    )),
+    ('urlvoid_ratio', operator.gt, (
+        (30, 25, 'High URLVoid detection ratio: {:.1f}%'),
+        (10, 10, 'Medium URLVoid detection ratio: {:.1f}%'),
+    )),
+    ('days_old', operator.lt, (
+        (30, 15, 'Very recent domain ({} days old)'),
+        (90, 5, 'Recent domain ({} days old)'),
+    )),
+)
+
+def _threat_features(results: Dict[str, Any], now: datetime, creation: Optional[datetime]) -> Dict[str, Any]:
     """
-    Calculate overall threat score based on analysis results
+    Extract the values scored by THREAT_RULES from the analysis results
     """
-    score = 0
-    factors = []
+    features = {}
     
     # VirusTotal detections
     threat_intel = results.get('threat_intelligence', {})
     if 'malicious' in threat_intel and 'suspicious' in threat_intel:
-        malicious = threat_intel['malicious']
-        suspicious = threat_intel['suspicious']
-        
-        if malicious > 5:
-            score += 40
-            factors.append(f'{malicious} malicious detections')
-        elif malicious > 0:
-            score += 20
-            factors.append(f'{malicious} malicious detections')
-        
-        if suspicious > 3:
-            score += 15
-            factors.append(f'{suspicious} suspicious detections')
+        features['vt_malicious'] = threat_intel['malicious']
+        features['vt_suspicious'] = threat_intel['suspicious']
     
     # URLVoid detections
-    reputation = results.get('reputation', {})
-    if 'urlvoid' in reputation and 'detection_ratio' in reputation['urlvoid']:
-        ratio = reputation['urlvoid']['detection_ratio']
-        if ratio > 30:
-            score += 25
-            factors.append(f'High URLVoid detection ratio: {ratio:.1f}%')
-        elif ratio > 10:
-            score += 10
-            factors.append(f'Medium URLVoid detection ratio: {ratio:.1f}%')
+    urlvoid = results.get('reputation', {}).get('urlvoid', {})
+    if 'detection_ratio' in urlvoid:
+        features['urlvoid_ratio'] = urlvoid['detection_ratio']
     
     # Recent domain (potential indicator)
     whois_info = results.get('whois_info', {})
-    if 'creation_date' in whois_info and whois_info['creation_date']:
+    # Reuse the datetime parsed during the WHOIS lookup; only a bare result
+    # dict needs the ISO string parsed (3.11 accepts a trailing 'Z' natively)
+    if creation is None and whois_info.get('creation_date'):
         try:
-            creation = datetime.fromisoformat(whois_info['creation_date'].replace('Z', '+00:00'))
-            days_old = (datetime.now() - creation.replace(tzinfo=None)).days
-            
-            if days_old < 30:
-                score += 15
-                factors.append(f'Very recent domain ({days_old} days old)')
-            elif days_old < 90:
-                score += 5
-                factors.append(f'Recent domain ({days_old} days old)')
-        except:
+            creation = datetime.fromisoformat(whois_info['creation_date']).replace(tzinfo=None)
+        except (TypeError, ValueError):
             pass
+    if creation is not None:
+        features['days_old'] = (now - creation).days
     
-    # Determine threat level
-    if score >= 60:
-        level = 'high'
-    elif score >= 30:
-        level = 'medium'
-    elif score > 0:
-        level = 'low'
-    else:
-        level = 'clean'
-    
-    return {
-        'score': score,
-        'level': level,
-        'factors': factors
-    }
+    return features
+
+def calculate_threat_score(
+    results: Dict[str, Any],
+    now: datetime = None,
+    creation: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Calculate overall threat score based on analysis results. `now` lets
+    a caller reuse one timestamp for the whole analysis, and `creation` the
+    WHOIS creation date already parsed during the lookup
+    """
+    return evaluate_threat_rules(THREAT_RULES, _threat_features(results, now or datetime.now(), creation))
 
 def main():
     parser = argparse.ArgumentParser(description='Domain Analysis Script')
     parser.add_argument('domain', help='Domain to analyze')
-    parser.add_argument('--format', choices=['json', 'text'], default='json')
+    parser.add_argument('--format', choices=['json', 'json-compact', 'text'], default='json')
     
     args = parser.parse_args()
     
@@ -314,7 +521,11 @@ def main():
         results = analyze_domain(args.domain)
         
         if args.format == 'json':
-            print(json.dumps(results, indent=2, default=str))
+            # orjson emits datetimes natively; str() covers any other WHOIS value type
+            sys.stdout.buffer.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        elif args.format == 'json-compact':
+            # Unindented, for the API that reads this output over a pipe
+            sys.stdout.buffer.write(orjson.dumps(results, default=str))
         else:
             # Text format output
             print(f"Domain Analysis Results for {args.domain}")
@@ -324,7 +535,7 @@ def main():
     
     except Exception as e:
         error_result = {'error': str(e), 'domain': args.domain}
-        if args.format == 'json':
+        if args.format != 'text':
             print(json.dumps(error_result))
         else:
             print(f"Error analyzing {args.domain}: {e}")
@@ -4,25 +4,65 @@ IP Analysis Script for OSINT
 Based on TFM requirements for IP intelligence gathering
 """
 
+import re
 import sys
 import json
-import requests
+import operator
+import orjson
+import asyncio
+import aiohttp
 import socket
 import argparse
 from typing import Dict, Any
 import os
+from whois.whois import NICClient
+
+from _common import (
+    QUOTA_MAX_WAIT, VT_CACHE_TTL, VT_LIMITER, RateLimiter, coalesced, create_session, disk_cached,
+    evaluate_threat_rules, with_session
+)
+
+# WHOIS fields we report, mapped to their output keys
+_WHOIS_RE = re.compile(r'^(NetName|Organization|OrgName|Country):[ \t]*(.+)$', re.MULTILINE)
+_WHOIS_KEYS = {
+    'NetName': 'net_name',
+    'Organization': 'organization',
+    'OrgName': 'organization',
+    'Country': 'country'
+}
+
+# Daily free-tier quotas, so a bulk run stops calling a saturated service
+# instead of collecting 429s
+_ABUSEIPDB_LIMITER = RateLimiter('AbuseIPDB', 1000, 86400, max_wait=QUOTA_MAX_WAIT)
+_IPAPI_LIMITER = RateLimiter('ipapi', 1000, 86400, max_wait=QUOTA_MAX_WAIT)
 
 def analyze_ip(ip_address: str) -> Dict[str, Any]:
     """
     Comprehensive IP analysis using multiple sources
     """
+    return asyncio.run(analyze_ip_async(ip_address))
+
+async def analyze_ip_async(ip_address: str) -> Dict[str, Any]:
+    """
+    Comprehensive IP analysis, running every source concurrently
+    """
+    # Reverse DNS and WHOIS block, so they run in worker threads alongside the API calls
+    async with create_session() as session:
+        geolocation, reputation, dns_info, threat_intelligence, whois_info = await asyncio.gather(
+            get_geolocation_async(ip_address, session),
+            get_reputation_async(ip_address, session),
+            asyncio.to_thread(get_dns_info, ip_address),
+            get_threat_intelligence_async(ip_address, session),
+            asyncio.to_thread(get_whois_info, ip_address)
+        )
+    
     results = {
         'ip': ip_address,
-        'geolocation': get_geolocation(ip_address),
-        'reputation': get_reputation(ip_address),
-        'dns_info': get_dns_info(ip_address),
-        'threat_intelligence': get_threat_intelligence(ip_address),
-        'whois': get_whois_info(ip_address)
+        'geolocation': geolocation,
+        'reputation': reputation,
+        'dns_info': dns_info,
+        'threat_intelligence': threat_intelligence,
+        'whois': whois_info
     }
     
     # Calculate threat score
@@ -31,30 +71,47 @@ def analyze_ip(ip_address: str) -> Dict[str, Any]:
     return results
 
 def get_geolocation(ip: str) -> Dict[str, Any]:
+    """
+    Get geolocation information for IP
+    """
+    return asyncio.run(with_session(get_geolocation_async, ip))
+
+@disk_cached(namespace='ipapi')
+async def get_geolocation_async(ip: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Get geolocation information for IP
     """
     try:
         # Using ipapi.co (free tier)
-        response = requests.get(f'https://ipapi.co/{ip}/json/', timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'country': data.get('country_name'),
-                'country_code': data.get('country_code'),
-                'city': data.get('city'),
-                'region': data.get('region'),
-                'latitude': data.get('latitude'),
-                'longitude': data.get('longitude'),
-                'isp': data.get('org'),
-                'asn': data.get('asn')
-            }
+        async with _IPAPI_LIMITER, session.get(
+            f'https://ipapi.co/{ip}/json/',
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            if response.status == 200:
+                data = await response.json(content_type=None)
+                return {
+                    'country': data.get('country_name'),
+                    'country_code': data.get('country_code'),
+                    'city': data.get('city'),
+                    'region': data.get('region'),
+                    'latitude': data.get('latitude'),
+                    'longitude': data.get('longitude'),
+                    'isp': data.get('org'),
+                    'asn': data.get('asn')
+                }
     except Exception as e:
         return {'error': str(e)}
     
     return {'error': 'Failed to get geolocation'}
 
 def get_reputation(ip: str) -> Dict[str, Any]:
+    """
+    Check IP reputation using AbuseIPDB (if API key available)
+    """
+    return asyncio.run(with_session(get_reputation_async, ip))
+
+@disk_cached(namespace='abuseipdb')
+async def get_reputation_async(ip: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Check IP reputation using AbuseIPDB (if API key available)
     """
@@ -72,30 +129,29 @@ def get_reputation(ip: str) -> Dict[str, Any]:
         params = {
             'ipAddress': ip,
             'maxAgeInDays': 90,
-            'verbose': True
+            'verbose': 'True'
         }
         
-        response = requests.get(
+        async with _ABUSEIPDB_LIMITER, session.get(
             'https://api.abuseipdb.com/api/v2/check',
             headers=headers,
             params=params,
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            data = response.json()['data']
-            return {
-                'abuse_confidence': data.get('abuseConfidencePercentage', 0),
-                'is_public': data.get('isPublic', True),
-                'is_whitelisted': data.get('isWhitelisted', False),
-                'country_code': data.get('countryCode'),
-                'usage_type': data.get('usageType'),
-                'isp': data.get('isp'),
-                'total_reports': data.get('totalReports', 0),
-                'last_reported': data.get('lastReportedAt')
-            }
-        else:
-            return {'error': f'API request failed: {response.status_code}'}
+            timeout=aiohttp.ClientTimeout(total=15)
+        ) as response:
+            if response.status == 200:
+                data = (await response.json(content_type=None))['data']
+                return {
+                    'abuse_confidence': data.get('abuseConfidencePercentage', 0),
+                    'is_public': data.get('isPublic', True),
+                    'is_whitelisted': data.get('isWhitelisted', False),
+                    'country_code': data.get('countryCode'),
+                    'usage_type': data.get('usageType'),
+                    'isp': data.get('isp'),
+                    'total_reports': data.get('totalReports', 0),
+                    'last_reported': data.get('lastReportedAt')
+                }
+            else:
+                return {'error': f'API request failed: {response.status}'}
             
     except Exception as e:
         return {'error': str(e)}
@@ -112,6 +168,13 @@ def get_dns_info(ip: str) -> Dict[str, Any]:
         return {'hostname': None}
 
 def get_threat_intelligence(ip: str) -> Dict[str, Any]:
+    """
+    Get threat intelligence using VirusTotal (if API key available)
+    """
+    return asyncio.run(with_session(get_threat_intelligence_async, ip))
+
+@coalesced(VT_CACHE_TTL)
+async def get_threat_intelligence_async(ip: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Get threat intelligence using VirusTotal (if API key available)
     """
@@ -123,28 +186,27 @@ def get_threat_intelligence(ip: str) -> Dict[str, Any]:
     try:
         headers = {'X-Apikey': api_key}
         
-        response = requests.get(
+        async with VT_LIMITER, session.get(
             f'https://www.virustotal.com/api/v3/ip_addresses/{ip}',
             headers=headers,
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            data = response.json()['data']['attributes']
-            stats = data.get('last_analysis_stats', {})
-            
-            return {
-                'malicious': stats.get('malicious', 0),
-                'suspicious': stats.get('suspicious', 0),
-                'clean': stats.get('harmless', 0),
-                'undetected': stats.get('undetected', 0),
-                'reputation': data.get('reputation', 0),
-                'country': data.get('country'),
-                'asn': data.get('asn'),
-                'as_owner': data.get('as_owner')
-            }
-        else:
-            return {'error': f'VirusTotal API request failed: {response.status_code}'}
+            timeout=aiohttp.ClientTimeout(total=15)
+        ) as response:
+            if response.status == 200:
+                data = (await response.json(content_type=None))['data']['attributes']
+                stats = data.get('last_analysis_stats', {})
+                
+                return {
+                    'malicious': stats.get('malicious', 0),
+                    'suspicious': stats.get('suspicious', 0),
+                    'clean': stats.get('harmless', 0),
+                    'undetected': stats.get('undetected', 0),
+                    'reputation': data.get('reputation', 0),
+                    'country': data.get('country'),
+                    'asn': data.get('asn'),
+                    'as_owner': data.get('as_owner')
+                }
+            else:
+                return {'error': f'VirusTotal API request failed: {response.status}'}
             
     except Exception as e:
         return {'error': str(e)}
@@ -154,83 +216,72 @@ def get_whois_info(ip: str) -> Dict[str, Any]:
     Get WHOIS information (simplified)
     """
     try:
-        import subprocess
-        result = subprocess.run(['whois', ip], capture_output=True, text=True, timeout=30)
+        # Query ARIN over a socket and follow its referral to the owning
+        # registry, instead of spawning the whois binary for every lookup
+        output = NICClient().whois(
+            ip, NICClient.ANICHOST, NICClient.WHOIS_RECURSE,
+            quiet=True, timeout=30, ignore_socket_errors=False
+        )
         
-        if result.returncode == 0:
-            # Parse basic info from whois output
-            lines = result.stdout.split('\n')
-            info = {}
-            
-            for line in lines:
-                if 'NetName:' in line:
-                    info['net_name'] = line.split(':', 1)[1].strip()
-                elif 'Organization:' in line or 'OrgName:' in line:
-                    info['organization'] = line.split(':', 1)[1].strip()
-                elif 'Country:' in line:
-                    info['country'] = line.split(':', 1)[1].strip()
-            
-            return info
-        else:
-            return {'error': 'WHOIS lookup failed'}
+        return _parse_whois(output)
             
     except Exception as e:
         return {'error': str(e)}
 
-def calculate_threat_score(results: Dict[str, Any]) -> Dict[str, Any]:
+def _parse_whois(output: str) -> Dict[str, str]:
     """
-    Calculate overall threat score based on analysis results
+    Basic info from whois output, in a single regex pass
+    """
+    info = {}
+    for match in _WHOIS_RE.finditer(output):
+        info[_WHOIS_KEYS[match.group(1)]] = match.group(2).strip()
+    
+    return info
+
+# Threat-score rules, scored by _common.evaluate_threat_rules
+THREAT_RULES = (
+    ('abuse_confidence', operator.gt, (
+        (75, 40, 'High AbuseIPDB confidence'),
+        (25, 20, 'Medium AbuseIPDB confidence'),
+    )),
+    ('vt_malicious', operator.gt, (
+        (5, 30, '{} malicious detections'),
+        (0, 15, '{} malicious detections'),
+    )),
+    ('vt_suspicious', operator.gt, (
+        (3, 10, '{} suspicious detections'),
+    )),
+)
+
+def _threat_features(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the values scored by THREAT_RULES from the analysis results
     """
-    score = 0
-    factors = []
+    features = {}
     
     # AbuseIPDB reputation
-    if 'abuse_confidence' in results.get('reputation', {}):
-        confidence = results['reputation']['abuse_confidence']
-        if confidence > 75:
-            score += 40
-            factors.append('High AbuseIPDB confidence')
-        elif confidence > 25:
-            score += 20
-            factors.append('Medium AbuseIPDB confidence')
+    reputation = results.get('reputation', {})
+    if 'abuse_confidence' in reputation:
+        features['abuse_confidence'] = reputation['abuse_confidence']
     
     # VirusTotal detections
     threat_intel = results.get('threat_intelligence', {})
     if 'malicious' in threat_intel and 'suspicious' in threat_intel:
-        malicious = threat_intel['malicious']
-        suspicious = threat_intel['suspicious']
-        
-        if malicious > 5:
-            score += 30
-            factors.append(f'{malicious} malicious detections')
-        elif malicious > 0:
-            score += 15
-            factors.append(f'{malicious} malicious detections')
-        
-        if suspicious > 3:
-            score += 10
-            factors.append(f'{suspicious} suspicious detections')
-    
-    # Determine threat level
-    if score >= 60:
-        level = 'high'
-    elif score >= 30:
-        level = 'medium'
-    elif score > 0:
-        level = 'low'
-    else:
-        level = 'clean'
+        features['vt_malicious'] = threat_intel['malicious']
+        features['vt_suspicious'] = threat_intel['suspicious']
     
-    return {
-        'score': score,
-        'level': level,
-        'factors': factors
-    }
+    return features
+
+def calculate_threat_score(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calculate overall threat score based on analysis results
+    """
+    return evaluate_threat_rules(THREAT_RULES, _threat_features(results))
 
 def main():
     parser = argparse.ArgumentParser(description='IP Analysis Script')
     parser.add_argument('ip', help='IP address to analyze')
-    parser.add_argument('--format', choices=['json', 'text'], default='json')
+    parser.add_argument('--format', choices=['json', 'json-compact', 'text'], default='json')
     
     args = parser.parse_args()
     
@@ -238,7 +289,10 @@ def main():
         results = analyze_ip(args.ip)
         
         if args.format == 'json':
-            print(json.dumps(results, indent=2))
+            sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        elif args.format == 'json-compact':
+            # Unindented, for the API that reads this output over a pipe
+            sys.stdout.buffer.write(orjson.dumps(results))
         else:
             # Text format output
             print(f"IP Analysis Results for {args.ip}")
@@ -248,7 +302,7 @@ def main():
     
     except Exception as e:
         error_result = {'error': str(e), 'ip': args.ip}
-        if args.format == 'json':
+        if args.format != 'text':
             print(json.dumps(error_result))
         else:
             print(f"Error analyzing {args.ip}: {e}")
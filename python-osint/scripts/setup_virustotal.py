@@ -5,6 +5,7 @@ Helps set up and test VirusTotal API integration
 """
 
 import os
+import re
 import sys
 import asyncio
 import logging
@@ -18,6 +19,8 @@ from api.clients import VirusTotalClient, VirusTotalAPIError
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+ENV_KEY_RE = re.compile(r'^VIRUSTOTAL_API_KEY=[^\r\n]*', re.MULTILINE)
+
 def get_api_key():
     """Get API key from environment or user input"""
     api_key = os.getenv('VIRUSTOTAL_API_KEY')
@@ -87,22 +90,18 @@ def create_env_file(api_key):
         with open(env_example_file, 'r') as f:
             env_content = f.read()
     
-    # Update or add VIRUSTOTAL_API_KEY
-    lines = env_content.split('\n')
-    updated = False
-    
-    for i, line in enumerate(lines):
-        if line.startswith('VIRUSTOTAL_API_KEY='):
-            lines[i] = f'VIRUSTOTAL_API_KEY="{api_key}"'
-            updated = True
-            break
+    # Update or add VIRUSTOTAL_API_KEY in a single regex pass over the file
+    key_line = f'VIRUSTOTAL_API_KEY="{api_key}"'
+    env_content, updated = ENV_KEY_RE.subn(lambda _: key_line, env_content, count=1)
     
     if not updated:
-        lines.append(f'VIRUSTOTAL_API_KEY="{api_key}"')
+        if env_content and not env_content.endswith('\n'):
+            env_content += '\n'
+        env_content += key_line + '\n'
     
     # Write back to .env
     with open(env_file, 'w') as f:
-        f.write('\n'.join(lines))
+        f.write(env_content)
     
     logger.info(f"✅ API key saved to {env_file}")
     return True
@@ -5,25 +5,117 @@ Based on TFM requirements for URL intelligence gathering
 """
 
 import sys
+import functools
 import json
-import requests
+import orjson
+import operator
+import asyncio
+import aiohttp
 import argparse
 import base64
-from urllib.parse import urlparse
-from typing import Dict, Any
+import contextlib
+from urllib.parse import urljoin, urlparse
+from typing import Dict, Any, List, Optional, Tuple
 import os
+import weakref
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+from _common import (
+    URLVOID_LIMITER, VT_LIMITER, create_session, disk_cached, evaluate_threat_rules, with_session
+)
+
+# Page bodies beyond this size are not downloaded further
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+# Redirect hops followed before the chain is reported as too long
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+# Page requests allowed in flight against any single host. Each host's
+# [semaphore, users] entry is dropped once nothing holds or waits on it
+HOST_CONCURRENCY = 4
+_host_slots: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], List[Any]]]' = weakref.WeakKeyDictionary()
+
+# Request settings fixed at import rather than rebuilt on every lookup
+VIRUSTOTAL_URLS_ENDPOINT = 'https://www.virustotal.com/api/v3/urls/'
+URLVOID_HOST_ENDPOINT = 'http://api.urlvoid.com/api1000/{identifier}/host/{host}'
+API_TIMEOUT = aiohttp.ClientTimeout(total=15)
+PAGE_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Tags the content summary reads, so the rest of a page need not be built
+HTML_SUMMARY_TAGS = ('title', 'meta', 'a', 'form', 'script')
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+def _create_session() -> aiohttp.ClientSession:
+    """
+    Session for one URL analysis run. Page fetches spread over many more
+    hosts than API lookups, so it keeps a wider pool and shorter-lived DNS
+    entries than the default
+    """
+    return create_session(limit=64, limit_per_host=8, ttl_dns_cache=300)
+
+@functools.lru_cache(maxsize=10000)
+def _parse(url: str):
+    """urlparse, memoized: batches often repeat the same URLs and hosts"""
+    return urlparse(url)
+
+@functools.lru_cache(maxsize=10000)
+def _vt_url_id(url: str) -> str:
+    """VirusTotal's identifier for a URL: unpadded URL-safe base64"""
+    return base64.urlsafe_b64encode(url.encode()).rstrip(b'=').decode()
 
 def analyze_url(url: str) -> Dict[str, Any]:
     """
     Comprehensive URL analysis using multiple sources
     """
+    return asyncio.run(analyze_url_async(url))
+
+def analyze_urls(urls: List[str], max_concurrency: int = 10) -> List[Dict[str, Any]]:
+    """
+    Analyze several URLs from one synchronous call, concurrently and over a
+    single connection pool; results keep the order of urls
+    """
+    return asyncio.run(analyze_urls_async(urls, max_concurrency))
+
+async def analyze_urls_async(urls: List[str], max_concurrency: int = 10) -> List[Dict[str, Any]]:
+    """
+    Analyze several URLs concurrently over one shared session
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def bounded(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyze_url_async(url, session)
+    
+    async with _create_session() as session:
+        return await asyncio.gather(*(bounded(url) for url in urls))
+
+async def analyze_url_async(url: str, session: aiohttp.ClientSession = None) -> Dict[str, Any]:
+    """
+    Comprehensive URL analysis, running every source concurrently
+    """
+    if session is None:
+        async with _create_session() as session:
+            return await analyze_url_async(url, session)
+    
+    reputation, threat_intelligence, (content_analysis, redirects) = await asyncio.gather(
+        get_reputation_async(url, session),
+        get_threat_intelligence_async(url, session),
+        fetch_page_async(url, session)
+    )
+    
     results = {
         'url': url,
         'url_info': parse_url(url),
-        'reputation': get_reputation(url),
-        'threat_intelligence': get_threat_intelligence(url),
-        'content_analysis': analyze_content(url),
-        'redirects': check_redirects(url)
+        'reputation': reputation,
+        'threat_intelligence': threat_intelligence,
+        'content_analysis': content_analysis,
+        'redirects': redirects
     }
     
     # Calculate threat score
@@ -36,7 +128,7 @@ def parse_url(url: str) -> Dict[str, Any]:
     Parse URL components
     """
     try:
-        parsed = urlparse(url)
+        parsed = _parse(url)
         return {
             'scheme': parsed.scheme,
             'hostname': parsed.hostname,
@@ -49,6 +141,13 @@ def parse_url(url: str) -> Dict[str, Any]:
         return {'error': str(e)}
 
 def get_reputation(url: str) -> Dict[str, Any]:
+    """
+    Check URL reputation using URLVoid (if API key available)
+    """
+    return asyncio.run(with_session(get_reputation_async, url))
+
+@disk_cached(namespace='urlvoid_host', key=lambda url: _parse(url).hostname)
+async def get_reputation_async(url: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Check URL reputation using URLVoid (if API key available)
     """
@@ -60,37 +159,43 @@ def get_reputation(url: str) -> Dict[str, Any]:
     
     try:
         # Extract domain from URL
-        domain = urlparse(url).hostname
+        domain = _parse(url).hostname
         if not domain:
             return {'error': 'Could not extract domain from URL'}
         
-        response = requests.get(
-            f'http://api.urlvoid.com/api1000/{urlvoid_id}/host/{domain}',
+        async with URLVOID_LIMITER, session.get(
+            URLVOID_HOST_ENDPOINT.format(identifier=urlvoid_id, host=domain),
             params={'key': urlvoid_key},
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            detections = data.get('detections', {})
-            engines = detections.get('engines', [])
-            
-            detected = sum(1 for engine in engines if engine.get('detected', False))
-            total = len(engines)
-            
-            return {
-                'detected_engines': detected,
-                'total_engines': total,
-                'detection_ratio': (detected / total * 100) if total > 0 else 0,
-                'engines': engines
-            }
-        else:
-            return {'error': f'URLVoid API request failed: {response.status_code}'}
+            timeout=API_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                data = await response.json(content_type=None)
+                detections = data.get('detections', {})
+                engines = detections.get('engines', [])
+                
+                detected = sum(1 for engine in engines if engine.get('detected', False))
+                total = len(engines)
+                
+                return {
+                    'detected_engines': detected,
+                    'total_engines': total,
+                    'detection_ratio': (detected / total * 100) if total > 0 else 0,
+                    'engines': engines
+                }
+            else:
+                return {'error': f'URLVoid API request failed: {response.status}'}
             
     except Exception as e:
         return {'error': str(e)}
 
 def get_threat_intelligence(url: str) -> Dict[str, Any]:
+    """
+    Get threat intelligence using VirusTotal (if API key available)
+    """
+    return asyncio.run(with_session(get_threat_intelligence_async, url))
+
+@disk_cached(namespace='vt_url', ttl=3600, key=_vt_url_id)
+async def get_threat_intelligence_async(url: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """
     Get threat intelligence using VirusTotal (if API key available)
     """
@@ -100,35 +205,29 @@ def get_threat_intelligence(url: str) -> Dict[str, Any]:
         return {'error': 'VirusTotal API key not configured'}
     
     try:
-        # Encode URL for VirusTotal API
-        url_id = base64.urlsafe_b64encode(url.encode()).decode().strip('=')
-        
-        headers = {'X-Apikey': api_key}
-        
-        response = requests.get(
-            f'https://www.virustotal.com/api/v3/urls/{url_id}',
-            headers=headers,
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            data = response.json()['data']['attributes']
-            stats = data.get('last_analysis_stats', {})
-            
-            return {
-                'malicious': stats.get('malicious', 0),
-                'suspicious': stats.get('suspicious', 0),
-                'clean': stats.get('harmless', 0),
-                'undetected': stats.get('undetected', 0),
-                'title': data.get('title', ''),
-                'last_final_url': data.get('last_final_url', url),
-                'categories': data.get('categories', {}),
-                'threat_names': data.get('threat_names', [])
-            }
-        elif response.status_code == 404:
-            return {'error': 'URL not found in VirusTotal database'}
-        else:
-            return {'error': f'VirusTotal API request failed: {response.status_code}'}
+        async with VT_LIMITER, session.get(
+            VIRUSTOTAL_URLS_ENDPOINT + _vt_url_id(url),
+            headers={'X-Apikey': api_key},
+            timeout=API_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                data = (await response.json(content_type=None))['data']['attributes']
+                stats = data.get('last_analysis_stats', {})
+                
+                return {
+                    'malicious': stats.get('malicious', 0),
+                    'suspicious': stats.get('suspicious', 0),
+                    'clean': stats.get('harmless', 0),
+                    'undetected': stats.get('undetected', 0),
+                    'title': data.get('title', ''),
+                    'last_final_url': data.get('last_final_url', url),
+                    'categories': data.get('categories', {}),
+                    'threat_names': data.get('threat_names', [])
+                }
+            elif response.status == 404:
+                return {'error': 'URL not found in VirusTotal database'}
+            else:
+                return {'error': f'VirusTotal API request failed: {response.status}'}
             
     except Exception as e:
         return {'error': str(e)}
@@ -137,154 +236,265 @@ def analyze_content(url: str) -> Dict[str, Any]:
     """
     Basic content analysis of the URL
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-        
-        content_info = {
-            'status_code': response.status_code,
-            'content_type': response.headers.get('Content-Type', ''),
-            'content_length': len(response.content),
-            'server': response.headers.get('Server', ''),
-            'final_url': response.url
-        }
-        
-        # Basic content analysis for HTML
-        if 'text/html' in content_info['content_type']:
-            from bs4 import BeautifulSoup
-            try:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                content_info.update({
-                    'title': soup.title.string if soup.title else '',
-                    'meta_description': '',
-                    'external_links': len([link for link in soup.find_all('a', href=True) 
-                                         if not link['href'].startswith('#')]),
-                    'forms': len(soup.find_all('form')),
-                    'scripts': len(soup.find_all('script'))
-                })
-                
-                # Get meta description
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                if meta_desc:
-                    content_info['meta_description'] = meta_desc.get('content', '')
-                
-            except:
-                pass
-        
-        return content_info
-        
-    except Exception as e:
-        return {'error': str(e)}
+    return asyncio.run(with_session(analyze_content_async, url))
+
+async def analyze_content_async(url: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    """
+    Basic content analysis of the URL
+    """
+    content_info, _ = await fetch_page_async(url, session)
+    return content_info
 
 def check_redirects(url: str) -> Dict[str, Any]:
     """
     Check URL redirects
     """
+    return asyncio.run(with_session(check_redirects_async, url))
+
+async def check_redirects_async(url: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    """
+    Check URL redirects
+    """
+    _, redirects = await fetch_page_async(url, session)
+    return redirects
+
+async def fetch_page_async(url: str, session: aiohttp.ClientSession) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Fetch the URL once, following redirects, and derive both the content
+    analysis and the redirect chain from that single response. Redirects
+    are followed here rather than by aiohttp so every hop takes a request
+    slot of the host it is sent to; PAGE_TIMEOUT applies per hop
+    """
+    history = []
+    hop_url = url
+    try:
+        while True:
+            async with _host_slot(_parse(hop_url).hostname), session.get(
+                hop_url,
+                headers=BROWSER_HEADERS,
+                timeout=PAGE_TIMEOUT,
+                allow_redirects=False
+            ) as response:
+                location = response.headers.get('Location') if response.status in REDIRECT_STATUSES else None
+                if location is None:
+                    content_type = response.headers.get('Content-Type', '')
+                    declared_length = response.content_length
+                    # Only HTML is analyzed, so other bodies of known size are never downloaded
+                    if 'text/html' in content_type or declared_length is None:
+                        content, truncated = await _read_capped(response)
+                    else:
+                        content, truncated = b'', False
+                    break
+            
+            history.append(response)
+            if len(history) >= MAX_REDIRECTS:
+                return {'error': f'Too many redirects ({len(history)})'}, _redirect_chain(url, history)
+            
+            hop_url = urljoin(str(response.url), location)
+            if _parse(hop_url).scheme not in ('http', 'https'):
+                raise aiohttp.NonHttpUrlRedirectClientError(hop_url)
+    
+    except Exception as e:
+        return {'error': str(e)}, {'error': str(e)}
+    
+    return _content_info(response, content, truncated), _redirect_chain(url, history, str(response.url))
+
+@contextlib.asynccontextmanager
+async def _host_slot(host: Optional[str]):
+    """
+    Hold one of the host's HOST_CONCURRENCY request slots, so batch runs
+    don't hammer a shared target or redirector. Kept per event loop, since
+    the sync wrappers each run their own
+    """
+    slots = _host_slots.setdefault(asyncio.get_running_loop(), {})
+    slot = slots.get(host)
+    if slot is None:
+        slot = slots[host] = [asyncio.Semaphore(HOST_CONCURRENCY), 0]
+    slot[1] += 1
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        async with slot[0]:
+            yield
+    finally:
+        slot[1] -= 1
+        if not slot[1]:
+            del slots[host]
+
+def _redirect_chain(url: str, history, final_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Redirect chain from the intermediate redirect responses
+    """
+    redirect_chain = [
+        {
+            'from': str(hop.url),
+            'to': hop.headers.get('Location', ''),
+            'status_code': hop.status
         }
-        
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=False)
-        
-        redirect_chain = []
-        current_url = url
-        
-        while response.status_code in [301, 302, 303, 307, 308]:
-            redirect_chain.append({
-                'from': current_url,
-                'to': response.headers.get('Location', ''),
-                'status_code': response.status_code
+        for hop in history
+    ]
+    
+    if final_url is None:
+        final_url = redirect_chain[-1]['to'] if redirect_chain else url
+    
+    return {
+        'redirect_count': len(redirect_chain),
+        'redirect_chain': redirect_chain,
+        'final_url': final_url
+    }
+
+def _content_info(response: aiohttp.ClientResponse, content: bytes, truncated: bool) -> Dict[str, Any]:
+    """
+    Basic content analysis of an already downloaded response
+    """
+    content_type = response.headers.get('Content-Type', '')
+    declared_length = response.content_length
+    
+    # The declared size covers bodies that were skipped or cut short
+    content_length = len(content)
+    if declared_length is not None and (truncated or not content):
+        content_length = declared_length
+    
+    content_info = {
+        'status_code': response.status,
+        'content_type': content_type,
+        'content_length': content_length,
+        'truncated': truncated,
+        'server': response.headers.get('Server', ''),
+        'final_url': str(response.url)
+    }
+    
+    # Basic content analysis for HTML
+    if 'text/html' in content_info['content_type'] and lxml is not None:
+        try:
+            content_info.update(_summarize_html(content, response.charset))
+        except:
+            pass
+    elif 'text/html' in content_info['content_type']:
+        from bs4 import BeautifulSoup, SoupStrainer
+        try:
+            # lxml is unavailable here, so html.parser is the only parser bs4
+            # has; building just the tags read below keeps it cheaper
+            soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer(HTML_SUMMARY_TAGS))
+            content_info.update({
+                'title': soup.title.string if soup.title else '',
+                'meta_description': '',
+                'external_links': len([link for link in soup.find_all('a', href=True) 
+                                     if not link['href'].startswith('#')]),
+                'forms': len(soup.find_all('form')),
+                'scripts': len(soup.find_all('script'))
             })
             
-            current_url = response.headers.get('Location', '')
-            if not current_url or len(redirect_chain) > 10:  # Prevent infinite loops
-                break
-                
-            response = requests.get(current_url, headers=headers, timeout=10, allow_redirects=False)
-        
-        return {
-            'redirect_count': len(redirect_chain),
-            'redirect_chain': redirect_chain,
-            'final_url': current_url
-        }
-        
-    except Exception as e:
-        return {'error': str(e)}
+            # Get meta description
+            meta_desc = soup.find('meta', attrs={'name': 'description'})
+            if meta_desc:
+                content_info['meta_description'] = meta_desc.get('content', '')
+            
+        except:
+            pass
+    
+    return content_info
 
-def calculate_threat_score(results: Dict[str, Any]) -> Dict[str, Any]:
+async def _read_capped(response: aiohttp.ClientResponse) -> Tuple[bytes, bool]:
     """
-    Calculate overall threat score based on analysis results
+    Read at most MAX_CONTENT_BYTES of a response body, returning the bytes
+    and whether the body was cut short
     """
-    score = 0
-    factors = []
+    chunks = []
+    total = 0
+    async for chunk in response.content.iter_chunked(65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total > MAX_CONTENT_BYTES:
+            return b''.join(chunks)[:MAX_CONTENT_BYTES], True
+    return b''.join(chunks), False
+
+def _summarize_html(content: bytes, charset: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Title, meta description and link/form/script counts of an HTML page,
+    parsed with lxml's C parser and queried with XPath
+    """
+    if not content.strip():
+        return {'title': '', 'meta_description': '', 'external_links': 0, 'forms': 0, 'scripts': 0}
+    
+    # Use the HTTP charset, else let lxml read a <meta> charset; pages that
+    # declare neither are taken as UTF-8 rather than lxml's Latin-1 default
+    if charset is None and b'charset' not in content[:4096].lower():
+        charset = 'utf-8'
+    try:
+        parser = lxml.html.HTMLParser(encoding=charset)
+    except LookupError:
+        parser = lxml.html.HTMLParser()
+    doc = lxml.html.document_fromstring(content, parser=parser)
+    title = doc.find('.//title')
+    meta_desc = doc.xpath('//meta[@name="description"]/@content')
+    
+    return {
+        'title': title.text if title is not None else '',
+        'meta_description': meta_desc[0] if meta_desc else '',
+        'external_links': int(doc.xpath('count(//a[@href][not(starts-with(@href, "#"))])')),
+        'forms': int(doc.xpath('count(//form)')),
+        'scripts': int(doc.xpath('count(//script)'))
+    }
+
+# Threat-score rules, scored by _common.evaluate_threat_rules
+THREAT_RULES = (
+    ('vt_malicious', operator.gt, (
+        (5, 40, '{} malicious detections'),
+        (0, 20, '{} malicious detections'),
+    )),
+    ('vt_suspicious', operator.gt, (
+        (3, 15, '{} suspicious detections'),
+    )),
+    ('urlvoid_ratio', operator.gt, (
+        (30, 25, 'High URLVoid detection ratio: {:.1f}%'),
+        (10, 10, 'Medium URLVoid detection ratio: {:.1f}%'),
+    )),
+    ('redirect_count', operator.gt, (
+        (3, 10, 'Multiple redirects ({})'),
+    )),
+    ('status_code', operator.ne, (
+        (200, 5, 'Non-200 status code: {}'),
+    )),
+)
+
+def _threat_features(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the values scored by THREAT_RULES from the analysis results
+    """
+    features = {}
     
     # VirusTotal detections
     threat_intel = results.get('threat_intelligence', {})
     if 'malicious' in threat_intel and 'suspicious' in threat_intel:
-        malicious = threat_intel['malicious']
-        suspicious = threat_intel['suspicious']
-        
-        if malicious > 5:
-            score += 40
-            factors.append(f'{malicious} malicious detections')
-        elif malicious > 0:
-            score += 20
-            factors.append(f'{malicious} malicious detections')
-        
-        if suspicious > 3:
-            score += 15
-            factors.append(f'{suspicious} suspicious detections')
+        features['vt_malicious'] = threat_intel['malicious']
+        features['vt_suspicious'] = threat_intel['suspicious']
     
     # URLVoid detections
     reputation = results.get('reputation', {})
     if 'detection_ratio' in reputation:
-        ratio = reputation['detection_ratio']
-        if ratio > 30:
-            score += 25
-            factors.append(f'High URLVoid detection ratio: {ratio:.1f}%')
-        elif ratio > 10:
-            score += 10
-            factors.append(f'Medium URLVoid detection ratio: {ratio:.1f}%')
+        features['urlvoid_ratio'] = reputation['detection_ratio']
     
     # Multiple redirects (suspicious)
     redirects = results.get('redirects', {})
     if 'redirect_count' in redirects:
-        count = redirects['redirect_count']
-        if count > 3:
-            score += 10
-            factors.append(f'Multiple redirects ({count})')
+        features['redirect_count'] = redirects['redirect_count']
     
     # Content analysis
     content = results.get('content_analysis', {})
     if 'status_code' in content:
-        if content['status_code'] != 200:
-            score += 5
-            factors.append(f'Non-200 status code: {content["status_code"]}')
+        features['status_code'] = content['status_code']
     
-    # Determine threat level
-    if score >= 60:
-        level = 'high'
-    elif score >= 30:
-        level = 'medium'
-    elif score > 0:
-        level = 'low'
-    else:
-        level = 'clean'
-    
-    return {
-        'score': score,
-        'level': level,
-        'factors': factors
-    }
+    return features
+
+def calculate_threat_score(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calculate overall threat score based on analysis results
+    """
+    return evaluate_threat_rules(THREAT_RULES, _threat_features(results))
 
 def main():
     parser = argparse.ArgumentParser(description='URL Analysis Script')
     parser.add_argument('url', help='URL to analyze')
-    parser.add_argument('--format', choices=['json', 'text'], default='json')
+    parser.add_argument('--format', choices=['json', 'json-compact', 'text'], default='json')
     parser.add_argument('--info', action='store_true', help='Show script information')
     
     args = parser.parse_args()
@@ -305,7 +515,10 @@ def main():
         results = analyze_url(args.url)
         
         if args.format == 'json':
-            print(json.dumps(results, indent=2, default=str))
+            sys.stdout.buffer.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        elif args.format == 'json-compact':
+            # Unindented, for the API that reads this output over a pipe
+            sys.stdout.buffer.write(orjson.dumps(results, default=str))
         else:
             # Text format output
             print(f"URL Analysis Results for {args.url}")
@@ -315,7 +528,7 @@ def main():
     
     except Exception as e:
         error_result = {'error': str(e), 'url': args.url}
-        if args.format == 'json':
+        if args.format != 'text':
             print(json.dumps(error_result))
         else:
             print(f"Error analyzing {args.url}: {e}")
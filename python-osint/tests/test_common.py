@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Shared Script Helper Tests
+Tests API rate limiting, the disk cache and in-memory request coalescing
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# The analysis scripts import their helpers as a top-level module
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import _common
+from _common import QuotaExhausted, RateLimiter, coalesced, disk_cached
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(_common, 'DISK_CACHE_PATH', str(tmp_path / 'analysis_cache.sqlite3'))
+    monkeypatch.setattr(_common, '_disk_cache', None)
+    yield
+    if _common._disk_cache is not None:
+        _common._disk_cache.close()
+
+class FakeLookup:
+    """Async (target, session) lookup recording the calls and sessions it gets"""
+    
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+        self.sessions = []
+        self.failing = False
+    
+    async def __call__(self, target, session):
+        self.calls.append(target)
+        self.sessions.append(session)
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            return {'error': 'upstream failed'}
+        return {'target': target}
+
+async def acquire(limiter, times):
+    for _ in range(times):
+        async with limiter:
+            pass
+
+def test_rate_limiter_allows_max_rate_without_waiting():
+    start = time.monotonic()
+    asyncio.run(acquire(RateLimiter('test', 3, 60), 3))
+    
+    assert time.monotonic() - start < 0.05
+
+def test_rate_limiter_waits_for_the_window_to_free():
+    start = time.monotonic()
+    asyncio.run(acquire(RateLimiter('test', 2, 0.2), 3))
+    
+    assert time.monotonic() - start >= 0.19
+
+def test_rate_limiter_raises_instead_of_a_long_wait():
+    limiter = RateLimiter('test', 1, 60, max_wait=1)
+    
+    with pytest.raises(QuotaExhausted, match='test quota exhausted'):
+        asyncio.run(acquire(limiter, 2))
+
+def test_exhausted_quota_does_not_take_a_slot():
+    limiter = RateLimiter('test', 1, 0.2, max_wait=0.1)
+    asyncio.run(acquire(limiter, 1))
+    with pytest.raises(QuotaExhausted):
+        asyncio.run(acquire(limiter, 1))
+    
+    time.sleep(0.25)
+    asyncio.run(acquire(limiter, 1))
+
+def test_disk_cached_serves_fresh_entries(disk_cache):
+    lookup = FakeLookup()
+    cached = disk_cached(namespace='test')(lookup)
+    
+    async def run():
+        return [
+            await cached('a.test', None),
+            await cached('a.test', None),
+            await cached('a.test', None, force_refresh=True)
+        ]
+    
+    assert asyncio.run(run()) == [{'target': 'a.test'}] * 3
+    assert lookup.calls == ['a.test', 'a.test']
+
+def test_disk_cached_keeps_namespaces_apart(disk_cache):
+    first, second = FakeLookup(), FakeLookup()
+    cached_first = disk_cached(namespace='first')(first)
+    cached_second = disk_cached(namespace='second')(second)
+    
+    async def run():
+        await cached_first('a.test', None)
+        await cached_second('a.test', None)
+    
+    asyncio.run(run())
+    assert first.calls == second.calls == ['a.test']
+
+def test_disk_cached_does_not_store_errors(disk_cache):
+    lookup = FakeLookup()
+    lookup.failing = True
+    cached = disk_cached(namespace='test')(lookup)
+    
+    async def run():
+        return [await cached('a.test', None), await cached('a.test', None)]
+    
+    assert asyncio.run(run()) == [{'error': 'upstream failed'}] * 2
+    assert len(lookup.calls) == 2
+
+def test_disk_cached_tags_stale_fallback(disk_cache):
+    lookup = FakeLookup()
+    cached = disk_cached(namespace='test', ttl=0)(lookup)
+    
+    async def run():
+        fresh = await cached('a.test', None)
+        lookup.failing = True
+        return fresh, await cached('a.test', None)
+    
+    fresh, stale = asyncio.run(run())
+    assert '_stale' not in fresh
+    assert stale == {'target': 'a.test', '_stale': True}
+
+def test_disk_cached_drops_entries_past_max_stale(disk_cache, monkeypatch):
+    monkeypatch.setattr(_common, 'DISK_CACHE_MAX_STALE', 0)
+    lookup = FakeLookup()
+    cached = disk_cached(namespace='test', ttl=0)(lookup)
+    
+    async def run():
+        await cached('a.test', None)
+        lookup.failing = True
+        return await cached('a.test', None)
+    
+    assert asyncio.run(run()) == {'error': 'upstream failed'}
+
+def test_disk_cached_skips_targets_keyed_to_none(disk_cache):
+    lookup = FakeLookup()
+    cached = disk_cached(namespace='test', key=lambda target: None)(lookup)
+    
+    async def run():
+        await cached('a.test', None)
+        await cached('a.test', None)
+    
+    asyncio.run(run())
+    assert len(lookup.calls) == 2
+
+def test_coalesced_shares_concurrent_lookups():
+    lookup = FakeLookup(delay=0.05)
+    cached = coalesced(60)(lookup)
+    
+    async def run():
+        results = await asyncio.gather(*(cached('a.test', None) for _ in range(5)))
+        return results, await cached('a.test', None)
+    
+    results, later = asyncio.run(run())
+    assert results == [{'target': 'a.test'}] * 5
+    assert later == {'target': 'a.test'}
+    assert lookup.calls == ['a.test']
+
+def test_coalesced_fetches_on_the_shared_session():
+    lookup = FakeLookup()
+    cached = coalesced(60)(lookup)
+    
+    async def run():
+        await cached('a.test', 'caller session')
+        return await _common.get_shared_session()
+    
+    shared = asyncio.run(run())
+    assert lookup.sessions == [shared]
+    # asyncio.run() closed it on shutdown
+    assert shared.closed
+
+def test_coalesced_survives_a_cancelled_caller():
+    lookup = FakeLookup(delay=0.05)
+    cached = coalesced(60)(lookup)
+    
+    async def run():
+        first = asyncio.ensure_future(cached('a.test', None))
+        second = asyncio.ensure_future(cached('a.test', None))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(run()) == {'target': 'a.test'}
+    assert lookup.calls == ['a.test']
+
+def test_coalesced_does_not_keep_errors():
+    lookup = FakeLookup()
+    lookup.failing = True
+    cached = coalesced(60)(lookup)
+    
+    async def run():
+        await cached('a.test', None)
+        await cached('a.test', None)
+    
+    asyncio.run(run())
+    assert len(lookup.calls) == 2
+
+def test_coalesced_evicts_the_oldest_answer():
+    lookup = FakeLookup()
+    cached = coalesced(60, max_entries=2)(lookup)
+    
+    async def run():
+        for target in ('a.test', 'b.test', 'c.test', 'a.test', 'c.test'):
+            await cached(target, None)
+    
+    asyncio.run(run())
+    assert lookup.calls == ['a.test', 'b.test', 'c.test', 'a.test']
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Dorking Service Tests
+Tests query deduplication and the categories reported by alias analyses
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.clients import GoogleSearchAPIError
+from api.data.dorking_templates import build_dork_placeholders
+from api.services.dorking_service import DorkingService, _filtered_templates
+
+class FakeGoogleClient:
+    """Answers every query with one result, failing queries that contain `fail_on`"""
+    
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.queries = []
+    
+    async def search(self, query, num_results):
+        self.queries.append(query)
+        await asyncio.sleep(0)
+        if self.fail_on and self.fail_on in query:
+            raise GoogleSearchAPIError('quota exceeded', status_code=429)
+        return {"searchInformation": {"totalResults": "1", "searchTime": 0.1}, "items": [{"link": query}]}
+
+def test_identical_queries_share_one_search():
+    client = FakeGoogleClient()
+    templates = (
+        {"dork": 'site:github.com "{target_clean}"', "objective": "first"},
+        {"dork": '"{target_alias}"', "objective": "other"},
+        {"dork": 'site:github.com "{target_clean}"', "objective": "duplicate"},
+    )
+    
+    searches = asyncio.run(DorkingService(client)._run_templates(
+        templates, 10, build_dork_placeholders(target_alias='someone')
+    ))
+    
+    assert sorted(client.queries) == ['"someone"', 'site:github.com "someone"']
+    assert [query for query, _ in searches] == ['site:github.com "someone"', '"someone"', 'site:github.com "someone"']
+    # Every template sharing the query gets the same result
+    assert searches[0][1] is searches[2][1]
+
+def test_categories_analyzed_skips_categories_whose_queries_all_failed():
+    templates = _filtered_templates("alias")
+    client = FakeGoogleClient(fail_on='filetype:')
+    
+    results = asyncio.run(DorkingService(client).analyze_alias_comprehensive('someone'))
+    
+    succeeded = {t["category"] for t in templates if 'filetype:' not in t["dork"]}
+    # At least one category only has failing templates
+    assert succeeded != {t["category"] for t in templates}
+    assert results["summary"]["categories_analyzed"] == sorted(succeeded)
+    assert results["summary"]["failed_queries"] == sum('filetype:' in t["dork"] for t in templates)
+
+def test_category_filter_limits_categories_analyzed():
+    category = _filtered_templates("alias")[0]["category"]
+    
+    results = asyncio.run(DorkingService(FakeGoogleClient()).analyze_alias_comprehensive(
+        'someone', category_filter=category
+    ))
+    
+    assert results["summary"]["categories_analyzed"] == [category]
+    assert results["total_templates_used"] == len(_filtered_templates("alias", None, category))
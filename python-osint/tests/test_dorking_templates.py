@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Dork Template Tests
+Tests placeholder filling of the dorking templates
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.data.dorking_templates import build_dork_placeholders, format_dork_template
+from api.services.dorking_service import DorkingService
+
+class FakeGoogleClient:
+    """Records the queries it is asked to search"""
+    
+    def __init__(self):
+        self.queries = []
+    
+    async def search(self, query, num_results):
+        self.queries.append(query)
+        return {"searchInformation": {"totalResults": "0", "searchTime": 0.1}}
+
+def test_format_fills_known_placeholders():
+    template = {"dork": 'site:github.com "{target_clean}" OR "{target_alias}"'}
+    
+    assert format_dork_template(template, target_alias='@someone') == 'site:github.com "someone" OR "@someone"'
+
+def test_format_rejects_unknown_placeholder():
+    template = {"dork": 'site:{target_site} "{target_alias}"'}
+    
+    with pytest.raises(KeyError, match='target_site'):
+        format_dork_template(template, target_alias='someone')
+
+def test_unknown_placeholder_fails_only_its_template():
+    client = FakeGoogleClient()
+    templates = (
+        {"dork": '"{target_alias}"', "objective": "known"},
+        {"dork": '"{target_site}"', "objective": "unknown"},
+    )
+    
+    searches = asyncio.run(DorkingService(client)._run_templates(
+        templates, 10, build_dork_placeholders(target_alias='someone')
+    ))
+    
+    assert client.queries == ['"someone"']
+    assert searches[0][0] == '"someone"'
+    assert searches[1][0] is None
+    assert isinstance(searches[1][1], KeyError)
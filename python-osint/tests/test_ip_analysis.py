@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+IP Analysis Script Tests
+Tests WHOIS output parsing and threat scoring
+"""
+
+import sys
+from pathlib import Path
+
+# The analysis scripts import their helpers as a top-level module
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from ip_analysis import _parse_whois, calculate_threat_score
+
+ARIN_OUTPUT = """
+# ARIN WHOIS data and services are subject to the Terms of Use
+
+NetRange:       8.8.8.0 - 8.8.8.255
+CIDR:           8.8.8.0/24
+NetName:        GOGL
+OrgName:        Google LLC
+Country:        US
+Comment:        Country: not a field when indented
+"""
+
+def test_parse_whois_reads_reported_fields():
+    assert _parse_whois(ARIN_OUTPUT) == {
+        'net_name': 'GOGL',
+        'organization': 'Google LLC',
+        'country': 'US'
+    }
+
+def test_parse_whois_keeps_the_last_value_of_repeated_fields():
+    output = "Organization:   Level 3 Parent, LLC (LPL-141)\nOrgName:        Google LLC\n"
+    
+    assert _parse_whois(output) == {'organization': 'Google LLC'}
+
+def test_parse_whois_ignores_fields_not_at_line_start():
+    assert _parse_whois("Comment: NetName: FAKE\n  Country: XX\n") == {}
+
+def test_parse_whois_empty_field_does_not_swallow_the_next_line():
+    assert _parse_whois("NetName:\nCountry:        NL\n") == {'country': 'NL'}
+
+def test_parse_whois_handles_crlf_output():
+    assert _parse_whois("NetName:   RIPE-NCC\r\nCountry:   NL\r\n") == {'net_name': 'RIPE-NCC', 'country': 'NL'}
+
+def test_threat_score_combines_rules():
+    results = {
+        'reputation': {'abuse_confidence': 80},
+        'threat_intelligence': {'malicious': 2, 'suspicious': 4}
+    }
+    
+    assert calculate_threat_score(results) == {
+        'score': 65,
+        'level': 'high',
+        'factors': ['High AbuseIPDB confidence', '2 malicious detections', '4 suspicious detections']
+    }
+
+def test_threat_score_skips_missing_features():
+    assert calculate_threat_score({'reputation': {'error': 'quota exhausted'}}) == {
+        'score': 0,
+        'level': 'clean',
+        'factors': []
+    }
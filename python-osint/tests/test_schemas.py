@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Response Schema Tests
+Tests frozen response models and their derived fields
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.schemas.google_search_schemas import SearchItem
+from api.schemas.haveibeenpwned_schemas import (
+    BreachedAccountResponse,
+    BreachedDomainResponse,
+    BreachResponse,
+    BulkAnalysisResponse,
+    HaveIBeenPwnedAnalysisResponse,
+    PwnedPasswordResponse
+)
+from api.schemas.virustotal_schemas import AnalysisStats
+
+def breach(name='Adobe'):
+    return BreachResponse(
+        name=name, title=name, domain='adobe.com', breach_date='2013-10-04',
+        added_date='2013-12-04', modified_date='2022-05-15', pwn_count=152445165,
+        description='', logo_path='', data_classes=['Email addresses', 'Passwords'],
+        is_verified=True, is_fabricated=False, is_sensitive=False, is_retired=False,
+        is_spam_list=False, is_malware=False, is_subscription_free=False
+    )
+
+def account(breach_count, verified=None):
+    verified = breach_count if verified is None else verified
+    return BreachedAccountResponse(
+        email='someone@example.com',
+        is_breached=breach_count > 0,
+        breach_count=breach_count,
+        breaches=[breach() for _ in range(breach_count)],
+        data_classes_affected=[],
+        verified_breaches_count=verified,
+        unverified_breaches_count=breach_count - verified
+    )
+
+def analysis(target, **checks):
+    return HaveIBeenPwnedAnalysisResponse(
+        target=target, target_type='email', analysis_timestamp='2024-01-01T00:00:00', **checks
+    )
+
+@pytest.mark.parametrize('model, field, value', [
+    (breach(), 'pwn_count', 0),
+    (PwnedPasswordResponse(is_pwned=True, pwn_count=5, hash_suffix='ABC'), 'pwn_count', 0),
+    (BreachedDomainResponse(email='a@example.com', breaches=['Adobe']), 'email', 'b@example.com'),
+    (SearchItem(kind='customsearch#result', title='t', link='https://example.com', display_link='example.com'), 'title', 'u'),
+    (AnalysisStats(malicious=1), 'malicious', 0),
+])
+def test_response_models_are_frozen(model, field, value):
+    with pytest.raises(ValidationError):
+        setattr(model, field, value)
+
+@pytest.mark.parametrize('pwn_count, level', [
+    (0, 'safe'), (9, 'low'), (99, 'medium'), (999, 'high'), (1000, 'critical'),
+])
+def test_password_risk_level_is_serialized(pwn_count, level):
+    response = PwnedPasswordResponse(is_pwned=pwn_count > 0, pwn_count=pwn_count, hash_suffix='ABC')
+    
+    assert response.model_dump()['risk_level'] == level
+
+@pytest.mark.parametrize('breach_count, verified, assessment', [
+    (0, 0, 'safe'), (2, 0, 'low'), (2, 2, 'medium'), (4, 4, 'high'), (5, 5, 'critical'),
+])
+def test_account_risk_assessment(breach_count, verified, assessment):
+    response = account(breach_count, verified)
+    
+    assert response.risk_assessment == assessment
+    assert response.model_dump()['risk_assessment'] == assessment
+
+def test_analysis_summary_combines_checks():
+    result = analysis(
+        'someone@example.com',
+        account_breaches=account(4),
+        password_analysis=PwnedPasswordResponse(is_pwned=True, pwn_count=5000, hash_suffix='ABC')
+    )
+    
+    summary = result.model_dump()['summary']
+    assert summary['total_checks_performed'] == 2
+    assert summary['breaches_found'] and summary['password_compromised']
+    assert summary['risk_level'] == 'critical'
+    assert 'Change this password immediately' in summary['recommendations']
+
+def test_bulk_summary_aggregates_results():
+    results = [
+        analysis('a@example.com', account_breaches=account(4)),
+        analysis('b@example.com', account_breaches=account(2)),
+        analysis('c@example.com', domain_breaches=[BreachedDomainResponse(email='c@example.com', breaches=['Adobe'])]),
+    ]
+    
+    summary = BulkAnalysisResponse(
+        total_items=3, items_processed=3, items_failed=0,
+        analysis_results=results, processing_time_seconds=0.1
+    ).model_dump()['summary']
+    
+    assert summary['total_breached_accounts'] == 2
+    assert summary['domains_with_breaches'] == 1
+    assert summary['highest_risk_level'] == 'high'
+    # Recommendations shared by several results are listed once
+    assert len(summary['recommendations']) == len(set(summary['recommendations']))
+
+def test_empty_bulk_summary():
+    response = BulkAnalysisResponse(
+        total_items=0, items_processed=0, items_failed=0,
+        analysis_results=[], processing_time_seconds=0.0
+    )
+    
+    assert response.summary['highest_risk_level'] == 'safe'
+    assert response.summary['total_breached_accounts'] == 0
+
+def test_analysis_stats_totals_stay_out_of_the_output():
+    stats = AnalysisStats(harmless=60, malicious=3, undetected=7)
+    
+    assert stats.total_engines == 70
+    assert stats.detection_ratio == '3/70'
+    assert 'total_engines' not in stats.model_dump()
+    assert 'detection_ratio' not in stats.model_dump()
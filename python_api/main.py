@@ -5,12 +5,17 @@ This creates a REST API that Symfony can call
 """
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional
+from functools import lru_cache
 import asyncio
-import json
+import importlib.util
 import subprocess
 import os
+import sys
+import time
+import orjson
 
 app = FastAPI(title="OSINT Analysis API", version="1.0.0")
 
@@ -25,6 +30,20 @@ class AnalysisResponse(BaseModel):
     error: Optional[str] = None
     execution_time: float
 
+# Largest batch accepted in one call, and analyses of a batch allowed to run
+# at the same time
+MAX_BATCH_ITEMS = 100
+BATCH_CONCURRENCY = 10
+
+class BatchRequest(BaseModel):
+    items: List[AnalysisRequest] = Field(..., max_length=MAX_BATCH_ITEMS)
+
+# Last /scripts listing, with the scripts directory mtime it was read at
+_scripts_listing: Dict[str, Any] = {"mtime": None, "scripts": []}
+
+# Helpers imported by the analysis scripts, not an analysis script itself
+SHARED_HELPERS_MODULE = "_common.py"
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_target(request: AnalysisRequest):
     """
@@ -35,7 +54,8 @@ async def analyze_target(request: AnalysisRequest):
         if not script_name:
             raise HTTPException(status_code=400, detail=f"Unsupported target type: {request.target_type}")
         
-        result = await execute_analysis_script(
+        result = await run_analysis(
+            request.target_type,
             script_name, 
             request.target_value, 
             request.config
@@ -55,23 +75,86 @@ async def analyze_target(request: AnalysisRequest):
             execution_time=0.0
         )
 
+@app.post("/analyze/batch", response_model=List[AnalysisResponse])
+async def analyze_batch(request: BatchRequest, stream: bool = False):
+    """
+    Analyze several targets in one call, running up to BATCH_CONCURRENCY at
+    once. Results keep the order of the request items, and a failing target
+    only fails its own entry. With stream=true, results are instead sent as
+    NDJSON lines in completion order, each tagged with its item index
+    """
+    if stream:
+        return StreamingResponse(stream_batch(request.items), media_type="application/x-ndjson")
+    
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def bounded(item: AnalysisRequest) -> AnalysisResponse:
+        async with semaphore:
+            return await analyze_target(item)
+    
+    results = await asyncio.gather(
+        *(bounded(item) for item in request.items),
+        return_exceptions=True
+    )
+    
+    return [
+        AnalysisResponse(status="error", data={}, error=str(result), execution_time=0.0)
+        if isinstance(result, Exception) else result
+        for result in results
+    ]
+
+async def stream_batch(items: List[AnalysisRequest]) -> AsyncIterator[bytes]:
+    """
+    Yield each batch result as an NDJSON line as soon as it finishes, so only
+    results still in flight are held in memory rather than the whole batch
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def bounded(index: int, item: AnalysisRequest):
+        async with semaphore:
+            try:
+                return index, await analyze_target(item)
+            except Exception as e:
+                return index, AnalysisResponse(status="error", data={}, error=str(e), execution_time=0.0)
+    
+    tasks = [asyncio.ensure_future(bounded(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            index, result = await next_result
+            yield orjson.dumps({"index": index, **result.model_dump()}) + b"\n"
+    finally:
+        # The client may disconnect mid-stream; don't leave analyses running
+        for task in tasks:
+            task.cancel()
+
 @app.get("/scripts")
 async def list_available_scripts():
     """
     List all available analysis scripts
     """
     scripts_dir = os.path.join(os.path.dirname(__file__), "scripts")
-    scripts = []
     
-    if os.path.exists(scripts_dir):
-        for file in os.listdir(scripts_dir):
-            if file.endswith('.py') and not file.startswith('__'):
-                scripts.append({
-                    "name": file,
-                    "target_type": file.replace('_analysis.py', '').replace('.py', '')
-                })
+    try:
+        mtime = os.stat(scripts_dir).st_mtime_ns
+    except FileNotFoundError:
+        return {"scripts": []}
+    
+    # A directory's mtime changes whenever entries are added, removed or
+    # renamed, so the listing only needs rescanning then
+    if _scripts_listing["mtime"] != mtime:
+        with os.scandir(scripts_dir) as entries:
+            _scripts_listing["scripts"] = [
+                {
+                    "name": entry.name,
+                    "target_type": entry.name.replace('_analysis.py', '').replace('.py', '')
+                }
+                for entry in entries
+                if entry.is_file() and entry.name.endswith('.py')
+                and not entry.name.startswith('__') and entry.name != SHARED_HELPERS_MODULE
+            ]
+        _scripts_listing["mtime"] = mtime
     
-    return {"scripts": scripts}
+    return {"scripts": _scripts_listing["scripts"]}
 
 def get_script_for_target(target_type: str) -> Optional[str]:
     """
@@ -87,11 +170,57 @@ def get_script_for_target(target_type: str) -> Optional[str]:
     
     return script_mapping.get(target_type)
 
+# Scripts exposing an async entry point that can be awaited in this process,
+# instead of paying for a fresh interpreter, imports and a JSON pipe per call
+ANALYZERS = {
+    'ip': ('ip_analysis.py', 'analyze_ip_async'),
+    'domain': ('domain_analysis.py', 'analyze_domain_async'),
+    'url': ('url_analysis.py', 'analyze_url_async'),
+}
+
+@lru_cache(maxsize=None)
+def load_analyzer(target_type: str) -> Callable:
+    """
+    Import an analysis script once and return its async entry point
+    """
+    script_name, function_name = ANALYZERS[target_type]
+    scripts_dir = os.path.join(os.path.dirname(__file__), "scripts")
+    script_path = os.path.join(scripts_dir, script_name)
+    
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script not found: {script_name}")
+    
+    # Scripts import their shared helpers (_common.py) as top-level modules,
+    # as they do when run directly
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    
+    spec = importlib.util.spec_from_file_location(script_name[:-3], script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, function_name)
+
+async def run_analysis(target_type: str, script_name: str, target_value: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run an analysis in-process when the script supports it. Requests carrying
+    their own config still get a subprocess, since the scripts read API keys
+    from the environment and that can't be scoped to one in-process call
+    """
+    if target_type not in ANALYZERS or config:
+        return await execute_analysis_script(script_name, target_value, config)
+    
+    start_time = time.time()
+    result_data = await load_analyzer(target_type)(target_value)
+    
+    return {
+        "data": result_data,
+        "execution_time": time.time() - start_time
+    }
+
 async def execute_analysis_script(script_name: str, target_value: str, config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute Python analysis script asynchronously
     """
-    import time
     start_time = time.time()
     
     scripts_dir = os.path.join(os.path.dirname(__file__), "scripts")
@@ -107,7 +236,7 @@ async def execute_analysis_script(script_name: str, target_value: str, config: D
     
     # Execute script
     process = await asyncio.create_subprocess_exec(
-        'python3', script_path, target_value, '--format=json',
+        'python3', script_path, target_value, '--format=json-compact',
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         env=env
@@ -119,8 +248,8 @@ async def execute_analysis_script(script_name: str, target_value: str, config: D
         raise RuntimeError(f"Script execution failed: {stderr.decode()}")
     
     try:
-        result_data = json.loads(stdout.decode())
-    except json.JSONDecodeError as e:
+        result_data = orjson.loads(stdout)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON output from script: {e}")
     
     execution_time = time.time() - start_time
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis Endpoint Tests
+Tests /analyze/batch ordering, failure isolation, streaming and size limits
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main
+
+# Later items finish first, so completion order differs from request order
+DELAYS = {'a.test': 0.06, 'b.test': 0.03, 'c.test': 0.0}
+
+async def fake_run_analysis(target_type, script_name, target_value, config):
+    await asyncio.sleep(DELAYS.get(target_value, 0))
+    if target_value == 'fail.test':
+        raise RuntimeError('lookup failed')
+    return {"data": {"target": target_value}, "execution_time": 0.0}
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "run_analysis", fake_run_analysis)
+    return TestClient(main.app)
+
+def batch(*targets):
+    return {"items": [{"target_type": "domain", "target_value": target} for target in targets]}
+
+def test_batch_keeps_request_order(client):
+    response = client.post("/analyze/batch", json=batch('a.test', 'b.test', 'c.test'))
+
+    assert response.status_code == 200
+    assert [item["data"]["target"] for item in response.json()] == ['a.test', 'b.test', 'c.test']
+
+def test_batch_failure_only_fails_its_own_item(client):
+    response = client.post("/analyze/batch", json=batch('a.test', 'fail.test', 'c.test'))
+
+    results = response.json()
+    assert [item["status"] for item in results] == ["success", "error", "success"]
+    assert results[1]["error"] == 'lookup failed'
+    assert results[2]["data"]["target"] == 'c.test'
+
+def test_batch_stream_tags_results_with_their_index(client):
+    response = client.post("/analyze/batch?stream=true", json=batch('a.test', 'fail.test', 'c.test'))
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    # The slowest item arrives last, however the others interleave
+    assert lines[-1]["index"] == 0
+    by_index = {line["index"]: line for line in lines}
+    assert by_index[0]["data"]["target"] == 'a.test'
+    assert by_index[1]["status"] == "error"
+
+def test_batch_rejects_oversized_requests(client):
+    targets = [f'{i}.test' for i in range(main.MAX_BATCH_ITEMS + 1)]
+
+    response = client.post("/analyze/batch", json=batch(*targets))
+
+    assert response.status_code == 422